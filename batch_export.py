@@ -0,0 +1,201 @@
+"""
+Headless bulk export of quotes and daily histories, for nightly jobs.
+Only uses StockDataProvider, so Tk and matplotlib are never imported.
+
+    python batch_export.py --symbols RELIANCE.NS TCS.NS --out exports
+    python batch_export.py --symbols-file nse_symbols.txt --format parquet --workers 16 --rate 4
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from transport import HOST_RATES, TokenBucket
+
+QUOTE_FIELDS = ['symbol', 'price', 'change', 'change_percent', 'volume', 'last_date', 'rows']
+
+
+# One provider per worker process (or shared by all threads), created on first use
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def rate_share(shares):
+    """HOST_RATES split `shares` ways, so that many processes together keep to the per-host budget"""
+    return {host: (rate / shares, max(1, burst // shares)) for host, (rate, burst) in HOST_RATES.items()}
+
+
+def get_provider(replay_dir, shares=1):
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            from stock_data import StockDataProvider
+            if replay_dir:
+                from data_backends import ReplayBackend
+                backend = ReplayBackend(replay_dir)
+            else:
+                from data_backends import LiveBackend
+                backend = LiveBackend(rates=rate_share(shares))
+            # Each symbol is read once, so keep the memory cache tiny
+            _provider = StockDataProvider(backend=backend, cache_size=8)
+        return _provider
+
+
+def export_symbol(symbol, period, out_dir, fmt, replay_dir=None, shares=1):
+    """
+    Worker: fetch one symbol, write its history straight to disk and return only the
+    small quote row, so full frames never travel back to (or pile up in) the parent.
+    `shares` is how many processes split the per-host rate limits.
+    """
+    data = get_provider(replay_dir, shares).get_ohlcv(symbol, period)
+    if len(data) < 2:
+        raise ValueError("no data returned")
+
+    path = os.path.join(out_dir, "history", f"{symbol}.{fmt}")
+    if fmt == "parquet":
+        data.to_parquet(path, index=False)
+    else:
+        data.to_csv(path, index=False)
+
+    latest, previous = data['Close'].iloc[-1], data['Close'].iloc[-2]
+    change = latest - previous
+    return {
+        'symbol': symbol,
+        'price': round(float(latest), 2),
+        'change': round(float(change), 2),
+        'change_percent': round(float(change / previous * 100), 2),
+        'volume': int(data['Volume'].iloc[-1]),
+        'last_date': data['date'].iloc[-1].strftime("%Y-%m-%d"),
+        'rows': len(data),
+    }
+
+
+class QuoteWriter:
+    """Buffers quote rows and flushes them to disk every `chunk_size` rows."""
+
+    def __init__(self, out_dir, fmt, chunk_size):
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.parts = 0
+        self.csv_path = os.path.join(out_dir, "quotes.csv")
+        if fmt == "csv":
+            with open(self.csv_path, "w", newline="") as f:
+                csv.DictWriter(f, QUOTE_FIELDS).writeheader()
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.fmt == "csv":
+            with open(self.csv_path, "a", newline="") as f:
+                csv.DictWriter(f, QUOTE_FIELDS).writerows(self.rows)
+        else:
+            import pandas as pd
+            self.parts += 1
+            pd.DataFrame(self.rows, columns=QUOTE_FIELDS).to_parquet(
+                os.path.join(self.out_dir, f"quotes-{self.parts:05d}.parquet"), index=False)
+        self.rows = []
+
+
+def read_symbols(args):
+    symbols = list(args.symbols or [])
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            for line in f:
+                line = line.split('#')[0].strip()
+                if line:
+                    symbols.append(line)
+    return list(dict.fromkeys(s.upper() for s in symbols))
+
+
+def run(args):
+    symbols = read_symbols(args)
+    if not symbols:
+        print("No symbols given. Use --symbols or --symbols-file.")
+        return 2
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("Parquet export needs pyarrow: pip install pyarrow")
+            return 2
+
+    os.makedirs(os.path.join(args.out, "history"), exist_ok=True)
+    quotes = QuoteWriter(args.out, args.format, args.chunk_size)
+    # Paces task starts; each request inside a task is also held to the per-host rate
+    limiter = TokenBucket(args.rate, burst=max(1, int(args.rate)))
+    pool_class = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+    # Threads share one provider and its rate limits; every process has its own
+    shares = args.workers if args.processes else 1
+
+    started = time.monotonic()
+    done_count, errors = 0, []
+    # Only keep a bounded number of symbols in flight so memory stays flat
+    max_in_flight = args.workers * 2
+    remaining = iter(symbols)
+    pending = {}
+
+    with pool_class(max_workers=args.workers) as pool:
+        while True:
+            while len(pending) < max_in_flight:
+                symbol = next(remaining, None)
+                if symbol is None:
+                    break
+                limiter.acquire()
+                future = pool.submit(export_symbol, symbol, args.period, args.out, args.format,
+                                     args.replay, shares)
+                pending[future] = symbol
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                symbol = pending.pop(future)
+                try:
+                    quotes.add(future.result())
+                except Exception as e:
+                    # DataSourceError says why (rate_limited, http, network); otherwise the exception type
+                    errors.append({'symbol': symbol, 'kind': getattr(e, 'kind', type(e).__name__), 'error': str(e)})
+                done_count += 1
+                if done_count % 100 == 0:
+                    print(f"{done_count}/{len(symbols)} done ({time.monotonic() - started:.0f}s)")
+
+    quotes.flush()
+    if errors:
+        with open(os.path.join(args.out, "errors.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, ['symbol', 'kind', 'error'])
+            writer.writeheader()
+            writer.writerows(errors)
+
+    print(f"Exported {len(symbols) - len(errors)}/{len(symbols)} symbols to {args.out} "
+          f"in {time.monotonic() - started:.1f}s ({len(errors)} failed)")
+    return 1 if errors and len(errors) == len(symbols) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export quotes and daily OHLCV histories without the GUI")
+    parser.add_argument("--symbols", nargs="*", help="symbols, e.g. RELIANCE.NS TCS.NS")
+    parser.add_argument("--symbols-file", help="file with one symbol per line ('#' starts a comment)")
+    parser.add_argument("--out", default=f"export-{datetime.now():%Y%m%d}", help="output directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--period", default="1y", help="history period (yfinance style, e.g. 1y, 5y, max)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--processes", action="store_true", help="use a process pool instead of threads")
+    parser.add_argument("--rate", type=float, default=5.0, help="max symbols started per second (0 = unlimited)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="quote rows buffered per write")
+    parser.add_argument("--replay", help="serve data from a replay fixtures directory instead of the network")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
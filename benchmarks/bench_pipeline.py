@@ -0,0 +1,190 @@
+"""
+End-to-end latency benchmarks for the StockSight pipeline, run offline against
+replayed fixtures so results are repeatable.
+
+    python benchmarks/bench_pipeline.py                  # run and compare with baseline.json
+    python benchmarks/bench_pipeline.py --save-baseline  # record a new baseline
+    python benchmarks/bench_pipeline.py --latency 0.2    # simulate a 200 ms network
+
+GUI cases (ChartWidget, NewsAnalysisWindow) are skipped when no display is available.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from data_backends import ReplayBackend
+from news_archive import NewsArchive
+from price_series import PriceSeries
+from price_store import PriceStore
+from stock_data import StockDataProvider
+from synthetic import write_fixtures
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Bar counts: one year of dailies, ten years of dailies, and a long intraday-sized series
+SIZES = {'1y': 250, '10y': 2500, 'long': 20000}
+
+
+def measure(fn, repeat, setup=None):
+    """Run fn `repeat` times and return the durations in milliseconds"""
+    timings = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    return {
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'runs': len(timings),
+    }
+
+
+def settle(root, canvas):
+    """Pump Tk events until the canvas' background render has finished and been shown"""
+    root.update()
+    while canvas.rendering:
+        # Sleep briefly so the render thread gets the GIL between polls
+        time.sleep(0.001)
+        root.update()
+
+
+def data_cases(provider, symbols, repeat):
+    """Provider paths; the memory cache is cleared first so each run goes through the store"""
+    results = {}
+    for label, symbol in symbols.items():
+        clear = lambda i: provider.cache.invalidate()
+        results[f'get_historical_data[{label}]'] = summarize(measure(
+            lambda i: provider.get_historical_data(symbol, period="max"), repeat, clear))
+    symbol = symbols['1y']
+    results['get_stock_price'] = summarize(measure(
+        lambda i: provider.get_stock_price(symbol), repeat, lambda i: provider.cache.invalidate()))
+    results['get_stock_news'] = summarize(measure(
+        lambda i: provider.get_stock_news(symbol), repeat, lambda i: provider.cache.invalidate('news')))
+    results['search_news'] = summarize(measure(
+        lambda i: provider.search_news("results"), repeat))
+    return results
+
+
+def gui_cases(provider, symbols, repeat):
+    """Widget paths, measured until the chart's off-screen render is on screen"""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Skipping GUI benchmarks: {e}")
+        return {}
+    root.withdraw()
+
+    from chart_widget import ChartWidget
+    from news_analysis_window import NewsAnalysisWindow
+
+    results = {}
+    chart = ChartWidget(root)
+    chart.get_frame().pack()
+
+    for label, symbol in symbols.items():
+        data = provider.get_historical_data(symbol, period="max")
+
+        def full_redraw(i):
+            # Alternate the symbol name so every run is a full rebuild
+            chart.update_chart(data, f"{symbol}#{i % 2}")
+            settle(root, chart.canvas)
+        results[f'ChartWidget.update_chart[{label}]'] = summarize(measure(full_redraw, repeat))
+
+        ticks = []
+        for i in range(repeat):
+            tick = data.to_frame()
+            tick.loc[tick.index[-1], 'Close'] *= 1 + 0.001 * (i + 1)
+            ticks.append(PriceSeries.from_frame(symbol, tick))
+
+        def live_tick(i):
+            # Same history with only the last price moving, as on an auto-refresh
+            chart.update_chart(ticks[i], symbol)
+            settle(root, chart.canvas)
+        chart.update_chart(data, symbol)
+        settle(root, chart.canvas)
+        results[f'ChartWidget.update_chart tick[{label}]'] = summarize(measure(live_tick, repeat))
+
+    news_item = provider.get_stock_news(symbols['1y'])[0]
+    window = NewsAnalysisWindow(root, symbols['1y'], news_item, provider)
+    window.withdraw()
+
+    def slide(i):
+        window.before_var.set(1 + (i * 7) % 90)
+        window.update_plot()
+        settle(root, window.canvas)
+    results['NewsAnalysisWindow.update_plot'] = summarize(measure(slide, repeat))
+
+    root.destroy()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print a comparison table; return the names of cases slower than the baseline allows"""
+    regressions = []
+    print(f"{'case':<45}{'p50 ms':>10}{'p95 ms':>10}{'base p50':>10}{'change':>9}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        change = ""
+        if base and base['p50_ms'] > 0:
+            ratio = stats['p50_ms'] / base['p50_ms']
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio > 1 + tolerance:
+                regressions.append(name)
+                change += " !"
+        base_p50 = f"{base['p50_ms']:.2f}" if base else "-"
+        print(f"{name:<45}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{base_p50:>10}{change:>9}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the StockSight data and render pipeline")
+    parser.add_argument("--repeat", type=int, default=30, help="runs per case")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated network latency per call, seconds")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown before failing")
+    parser.add_argument("--no-gui", action="store_true", help="skip the Tk/matplotlib cases")
+    parser.add_argument("--save-baseline", action="store_true", help="write results to baseline.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        symbols = {label: f"BENCH{label.upper()}.NS" for label in SIZES}
+        for label, symbol in symbols.items():
+            write_fixtures(os.path.join(tmp, "fixtures"), [symbol], SIZES[label], n_articles=100)
+
+        provider = StockDataProvider(store=PriceStore(os.path.join(tmp, "store")),
+                                     backend=ReplayBackend(os.path.join(tmp, "fixtures"), latency=args.latency),
+                                     news_archive=NewsArchive(os.path.join(tmp, "news.db")))
+
+        results = data_cases(provider, symbols, args.repeat)
+        if not args.no_gui:
+            results.update(gui_cases(provider, symbols, args.repeat))
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {BASELINE_FILE}")
+    elif regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Screener throughput over a synthetic universe written to a temporary price store.
+
+    python benchmarks/bench_screener.py                    # 2,000 symbols x 1 year
+    python benchmarks/bench_screener.py --symbols 500 --workers 1
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_store import PriceStore, OHLCV_COLUMNS
+from screener import PRESETS, run_screen
+from synthetic import synthetic_ohlcv
+
+
+def write_universe(store, n_symbols, n_bars):
+    for i in range(n_symbols):
+        frame = synthetic_ohlcv(n_bars, seed=i).reset_index().rename(columns={'Date': 'date'})
+        frame['date'] = frame['date'].dt.tz_localize(None)
+        store.save(f"SYM{i:05d}.NS", frame[OHLCV_COLUMNS], {'covered_from': 'max'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the multi-symbol screener")
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--bars", type=int, default=250)
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = PriceStore(tmp)
+        started = time.perf_counter()
+        write_universe(store, args.symbols, args.bars)
+        print(f"Wrote {args.symbols} symbols in {time.perf_counter() - started:.1f}s "
+              f"({os.cpu_count()} CPUs, workers={args.workers or 'auto'})\n")
+
+        print(f"{'screen':<32}{'hits':>7}{'best s':>9}")
+        for name, expression in PRESETS.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = run_screen(expression, tmp, workers=args.workers)
+                timings.append(time.perf_counter() - started)
+            print(f"{name:<32}{len(results):>7}{min(timings):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Startup-time benchmark for the StockSight window.
+
+    python benchmarks/bench_startup.py --runs 5
+
+Reports, over several fresh processes:
+  * import main      - cost of importing main.py (no display needed)
+  * first frame      - process start until the Tk window is first painted
+  * ready            - process start until the chart and data provider are usable
+The window cases are skipped when no display is available.
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def time_import():
+    """Seconds spent importing main.py in a fresh interpreter"""
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def time_window():
+    """(first_frame, ready) seconds from spawning main.py, or None without a display"""
+    env = dict(os.environ, STOCKSIGHT_STARTUP_PROBE="1")
+    started = time.time()
+    out = subprocess.run([sys.executable, "main.py"], cwd=ROOT, env=env,
+                         capture_output=True, text=True, timeout=120)
+    marks = {}
+    for line in out.stdout.splitlines():
+        name, _, stamp = line.partition(" ")
+        if name in ("first_frame", "ready"):
+            marks[name] = float(stamp) - started
+    if "first_frame" not in marks:
+        print(f"Skipping window timings: {out.stderr.strip().splitlines()[-1] if out.stderr else 'no output'}")
+        return None
+    return marks["first_frame"], marks.get("ready")
+
+
+def report(name, samples):
+    samples = [s * 1000 for s in samples if s is not None]
+    if samples:
+        print(f"{name:<15}p50 {np.percentile(samples, 50):8.1f} ms   p95 {np.percentile(samples, 95):8.1f} ms   ({len(samples)} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure StockSight startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report("import main", [time_import() for _ in range(args.runs)])
+
+    windows = []
+    for _ in range(args.runs):
+        result = time_window()
+        if result is None:
+            break
+        windows.append(result)
+    if windows:
+        report("first frame", [w[0] for w in windows])
+        report("ready", [w[1] for w in windows])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Throughput of the shared transport against a local stub server that behaves like a
+throttling data provider: it allows a fixed request rate, answers 429 (with
+Retry-After) beyond it, and fails a small share of requests with 503.
+
+    python benchmarks/bench_transport.py                     # 200 requests from 16 threads
+    python benchmarks/bench_transport.py --requests 500 --server-rate 20
+
+"naive" is a bare requests.get per call (new connection, no limit, no retries), as the
+provider did before; "transport" is RateLimitedSession held to the server's rate.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import requests
+from transport import RateLimitedSession, DataSourceError
+
+
+class StubServer(ThreadingHTTPServer):
+    """Serves a small JSON body at up to `rate` requests per second"""
+    daemon_threads = True
+
+    def __init__(self, rate, burst, error_rate):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.rate = rate
+        self.tokens = burst
+        self.burst = burst
+        self.updated = time.monotonic()
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.statuses = {}
+
+    def admit(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def count(self, status):
+        with self.lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        if not self.server.admit():
+            status, body = 429, b'{"error": "Too Many Requests"}'
+        elif random.random() < self.server.error_rate:
+            status, body = 503, b'{"error": "Service Unavailable"}'
+        else:
+            status, body = 200, b'{"chart": {"result": []}}'
+        self.server.count(status)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_case(fetch, url, n_requests, threads):
+    """Fire n_requests from a thread pool; returns (elapsed seconds, successes, latencies ms)"""
+    latencies, ok = [], 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal ok
+        start = time.perf_counter()
+        success = fetch(f"{url}?i={i}")
+        with lock:
+            latencies.append((time.perf_counter() - start) * 1000)
+            ok += success
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(n_requests)))
+    return time.perf_counter() - started, ok, latencies
+
+
+def naive_fetch(url):
+    try:
+        return requests.get(url, timeout=10).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rate-limited transport against a local stub server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--server-rate", type=float, default=50.0, help="requests per second the stub allows")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="share of admitted requests failing with 503")
+    args = parser.parse_args()
+
+    session = RateLimitedSession(rates={'127.0.0.1': (args.server_rate * 0.9, 5)})
+
+    def transport_fetch(url):
+        try:
+            return session.get(url, timeout=10).status_code == 200
+        except DataSourceError:
+            return False
+
+    print(f"{'case':<12}{'ok':>8}{'429s':>8}{'503s':>8}{'conns':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+    for name, fetch in (('naive', naive_fetch), ('transport', transport_fetch)):
+        # A fresh server per case, so one case's throttling doesn't leak into the next
+        server = StubServer(args.server_rate, burst=5, error_rate=args.error_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/v8/finance/chart"
+        elapsed, ok, latencies = run_case(fetch, url, args.requests, args.threads)
+        server.shutdown()
+        server.server_close()
+        print(f"{name:<12}{ok:>8}{server.statuses.get(429, 0):>8}{server.statuses.get(503, 0):>8}"
+              f"{server.connections:>8}{ok / elapsed:>9.1f}"
+              f"{np.percentile(latencies, 50):>9.1f}{np.percentile(latencies, 95):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from data_backends import save_history_fixture, save_news_fixture
+from stock_data import news_query
+
+
+def synthetic_ohlcv(n_bars, seed=0, start_price=1000.0):
+    """Deterministic random-walk daily bars shaped like a yfinance history() frame"""
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.015, n_bars)))
+    open_ = close * np.exp(rng.normal(0, 0.005, n_bars))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n_bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n_bars))
+    volume = rng.integers(100_000, 10_000_000, n_bars)
+    index = pd.bdate_range(end=datetime.now().date(), periods=n_bars, tz='Asia/Kolkata', name='Date')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume},
+                        index=index)
+
+
+def synthetic_news(symbol, n_articles, seed=0, days=300):
+    """Deterministic gnews-style payload spread over the last `days` days"""
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    articles = []
+    for i in range(n_articles):
+        published = now - timedelta(days=int(rng.integers(0, days)), minutes=int(rng.integers(0, 1440)))
+        articles.append({
+            'title': f"{symbol} headline {i}: shares move on results",
+            'published date': published.strftime('%a, %d %b %Y %H:%M:%S GMT'),
+            'publisher': {'title': 'Synthetic Wire'},
+            'url': f"https://example.com/{symbol.lower()}/{i}",
+        })
+    return articles
+
+
+def write_fixtures(fixtures_dir, symbols, n_bars, n_articles):
+    """Create replay fixtures for every symbol (history plus the query get_stock_news uses)"""
+    for seed, symbol in enumerate(symbols):
+        save_history_fixture(fixtures_dir, symbol, synthetic_ohlcv(n_bars, seed=seed))
+        save_news_fixture(fixtures_dir, news_query(symbol), synthetic_news(symbol, n_articles, seed=seed))
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a per-kind time-to-live."""
+
+    def __init__(self, maxsize=256, ttls=None, default_ttl=60):
+        self.maxsize = maxsize
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind, key):
+        """Return the cached value, or None if it is missing or expired"""
+        with self._lock:
+            entry = self._data.get((kind, key))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[(kind, key)]
+                return None
+            self._data.move_to_end((kind, key))
+            return value
+
+    def set(self, kind, key, value):
+        """Store a value, evicting the least recently used entries when full"""
+        ttl = self.ttls.get(kind, self.default_ttl)
+        with self._lock:
+            self._data[(kind, key)] = (time.monotonic() + ttl, value)
+            self._data.move_to_end((kind, key))
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, kind=None, key=None):
+        """Drop one entry, every entry of a kind, or everything"""
+        with self._lock:
+            if kind is None:
+                self._data.clear()
+            elif key is not None:
+                self._data.pop((kind, key), None)
+            else:
+                for cache_key in [k for k in self._data if k[0] == kind]:
+                    del self._data[cache_key]
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Lets concurrent callers asking for the same key share one in-flight call."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            # Someone else is already fetching this; wait for their result
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
@@ -0,0 +1,51 @@
+import threading
+from concurrent.futures import Future
+
+
+class Cancelled(Exception):
+    """Raised by work that notices its load has been superseded"""
+
+
+class CancelToken:
+    """
+    Tags one load with its generation. `signal` is a Future that completes on cancel,
+    so a loader can wait on its fetches and its own cancellation at the same time.
+    """
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.signal = Future()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self.signal.done()
+
+    def cancel(self):
+        with self._lock:
+            if not self.signal.done():
+                self.signal.set_result(self.generation)
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise Cancelled(f"load generation {self.generation} was superseded")
+
+
+class Generations:
+    """Hands out one token per load; starting a new load cancels the previous one."""
+
+    def __init__(self):
+        self.current = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            if self.current is not None:
+                self.current.cancel()
+            self._count += 1
+            self.current = CancelToken(self._count)
+            return self.current
+
+    def is_current(self, token):
+        return token is self.current and not token.cancelled
@@ -1,69 +1,384 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from contextlib import nullcontext
+import matplotlib.dates as mdates
 from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
+from decimation import lttb
+from indicators import AVAILABLE_INDICATORS, IndicatorEngine
+from offscreen_canvas import OffscreenCanvasTkAgg, OffscreenNavigationToolbar
+from tracing import span
+
+LINE_STYLE = dict(linewidth=2, color='#2E86AB')
+
+# Never decimate below this many points, even on a tiny canvas
+MIN_PLOT_POINTS = 200
+
+INDICATOR_COLORS = {
+    'SMA 20': '#F18F01',
+    'SMA 50': '#C73E1D',
+    'EMA 20': '#6A4C93',
+    'VWAP': '#3B8B5A',
+    'RSI 14': '#6A4C93',
+    'Volume': '#8FA3B0',
+}
+
+# Subplots below the price axes, in display order, with their height ratio
+SUBPLOTS = {'rsi': 1, 'volume': 1}
+
+# Matplotlib date number of 1970-01-01, for converting epoch seconds
+UNIX_EPOCH = mdates.date2num(np.datetime64('1970-01-01T00:00:00'))
+
+
+def reading(source):
+    """Hold a BarRingBuffer's lock while reading its bars; a PriceSeries never changes"""
+    return getattr(source, 'lock', None) or nullcontext()
+
 
 class ChartWidget:
     def __init__(self, parent):
         self.parent = parent
         self.frame = ttk.Frame(parent)
         
+        # Indicator toggles
+        toggles = ttk.Frame(self.frame)
+        toggles.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(toggles, text="Indicators:").pack(side=tk.LEFT, padx=(0, 5))
+        self.indicator_vars = {}
+        for name in AVAILABLE_INDICATORS:
+            var = tk.BooleanVar(value=False)
+            ttk.Checkbutton(toggles, text=name, variable=var,
+                            command=lambda n=name: self.toggle_indicator(n)).pack(side=tk.LEFT, padx=2)
+            self.indicator_vars[name] = var
+
         # Create matplotlib figure
         self.figure = Figure(figsize=(8, 4), dpi=100)
-        self.ax = self.figure.add_subplot(111)
+        self.figure.patch.set_facecolor('#f0f0f0')
+        # Laid out as part of every full draw, so the layout also runs on the render thread
+        self.figure.set_layout_engine('tight')
         
-        # Create canvas
-        self.canvas = FigureCanvasTkAgg(self.figure, self.frame)
+        # Full redraws render on a worker thread; changes to the figure wait for them
+        self.canvas = OffscreenCanvasTkAgg(self.figure, self.frame)
+
+        # Toolbar for zoom/pan; the series is re-decimated to whatever is visible
+        self.toolbar = OffscreenNavigationToolbar(self.canvas, self.frame, pack_toolbar=False)
+        self.toolbar.pack(side=tk.BOTTOM, fill=tk.X)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
-        # Style the chart
-        self.figure.patch.set_facecolor('#f0f0f0')
-        self.ax.set_facecolor('#ffffff')
+        # Persistent artists: the settled history is drawn normally, while the
+        # segment to the latest bar and the indicators are animated and blitted
+        # on top of a cached background
+        self.symbol = None
+        self.title = None
+        self.source = None
+        self.last_bar = None
+        self.dates = None
+        self.prices = None
+        self.axes = {}
+        self.price_line = None
+        self.live_line = None
+        self.live_marker = None
+        self.indicator_artists = {}
+        self.engine = IndicatorEngine()
+        self.background = None
+        self.redecimate_pending = False
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.mpl_connect('resize_event', self.on_view_changed)
         
         # Initialize empty chart
         self.plot_empty_chart()
         
+    @property
+    def ax(self):
+        return self.axes['price']
+
+    def build_axes(self):
+        """Price axes on top, then one shared-x subplot per panel that has an enabled indicator"""
+        self.figure.clear()
+        panels = [p for p in SUBPLOTS if any(i.panel == p for i in self.engine.indicators.values())]
+        ratios = [3] + [SUBPLOTS[p] for p in panels]
+        grid = self.figure.add_gridspec(len(ratios), 1, height_ratios=ratios)
+
+        self.axes = {'price': self.figure.add_subplot(grid[0])}
+        for row, panel in enumerate(panels, start=1):
+            self.axes[panel] = self.figure.add_subplot(grid[row], sharex=self.axes['price'])
+        for ax in self.axes.values():
+            ax.set_facecolor('#ffffff')
+
     def plot_empty_chart(self):
         """Display empty chart with placeholder"""
-        self.ax.clear()
+        self.build_axes()
+        self.symbol = None
+        self.source = None
+        self.price_line = self.live_line = self.live_marker = None
+        self.indicator_artists = {}
         self.ax.text(0.5, 0.5, 'Search for a stock to view chart', 
                     horizontalalignment='center', verticalalignment='center',
                     transform=self.ax.transAxes, fontsize=12, color='gray')
         self.ax.set_title('Stock Price Chart')
         self.canvas.draw()
     
+    def toggle_indicator(self, name):
+        self.canvas.run_when_idle(self.apply_toggle, name)
+
+    def apply_toggle(self, name):
+        """Add or remove an indicator; the layout may change, so the chart is rebuilt"""
+        with reading(self.source):
+            if self.indicator_vars[name].get():
+                self.engine.add(name, self.source.to_frame() if self.source is not None else None)
+            else:
+                self.engine.remove(name)
+            if self.source is not None:
+                self.build_chart(self.source, self.dates, self.prices, self.symbol, self.title, reset_engine=False)
+
     def update_chart(self, data, symbol):
-        """Update chart with new stock data"""
-        if data.empty:
-            self.plot_empty_chart()
+        """Update chart with new stock data, redrawing only what changed"""
+        # Only the newest data matters if several updates arrive during one render
+        self.canvas.run_when_idle(self.apply_update, data, symbol, latest_only=True)
+
+    def apply_update(self, data, symbol):
+        with span('chart.update', symbol=symbol, rows=len(data)):
+            if data.empty:
+                self.plot_empty_chart()
+                return
+
+            # A PriceSeries has the same bar interface as BarRingBuffer, so it is its own source
+            dates = data.timestamps / 86400 + UNIX_EPOCH
+            self.apply_series(data, dates, data.close, symbol, f'{symbol} - Stock Price Trend')
+
+    def update_intraday(self, buffer, symbol):
+        """Stream 1-minute bars straight from a BarRingBuffer, through zero-copy views"""
+        self.canvas.run_when_idle(self.apply_intraday, buffer, symbol, latest_only=True)
+
+    def apply_intraday(self, buffer, symbol):
+        with span('chart.intraday', symbol=symbol, bars=len(buffer)), buffer.lock:
+            if not len(buffer):
+                self.plot_empty_chart()
+                return
+            timestamps, _ = buffer.view()
+            dates = timestamps / 86400 + UNIX_EPOCH
+            # A copy, not a view: the poller keeps writing into the buffer, and the next
+            # update's continuation check needs these prices as they were plotted
+            self.apply_series(buffer, dates, buffer.field('Close').copy(), f'{symbol} (1m)',
+                              f'{symbol} - Intraday (1 min)')
+
+    def apply_series(self, source, dates, prices, key, title):
+        """
+        Shared by daily and intraday updates; `key` identifies the series being shown.
+        `dates` and `prices` are kept for redrawing, so they must not change afterwards;
+        the caller holds the source's lock.
+        """
+        if key != self.symbol or self.price_line is None or not self.is_continuation(dates, prices):
+            self.build_chart(source, dates, prices, key, title)
             return
             
-        self.ax.clear()
+        n_old = len(self.dates)
+        appended = len(dates) > n_old
+        last_bar = source.bar(len(dates) - 1)
+        if not appended and last_bar == self.last_bar:
+            return  # Nothing moved since the last refresh
         
-        # Plot the price line
-        self.ax.plot(data['date'], data['price'], 
-                    linewidth=2, color='#2E86AB', marker='o', markersize=3)
+        # Roll the indicators forward from the previous last bar (which may have been
+        # revised) instead of recomputing them over the whole history
+        with span('chart.indicators', symbol=key, bars=len(dates) - n_old + 1):
+            for i in range(n_old - 1, len(dates)):
+                self.engine.update(source.bar(i))
+
+        self.source, self.dates, self.prices, self.last_bar = source, dates, prices, last_bar
+        self.set_live_data()
+
+        if appended:
+            # New bars: extend the settled lines in place
+            self.redecimate()
+            self.rescale_and_draw()
+        elif self.live_values_fit():
+            # Only the last bar changed and it still fits: blit just the live layer
+            self.set_indicator_last_values()
+            self.blit_live()
+        else:
+            self.redecimate()
+            self.rescale_and_draw()
+
+    def is_continuation(self, dates, prices):
+        """Cheap check that new data extends the plotted series rather than replacing it"""
+        n = len(self.dates)
+        if len(dates) < n or n < 2:
+            return False
+        return (dates[0] == self.dates[0] and dates[n - 2] == self.dates[n - 2]
+                and prices[n - 2] == self.prices[n - 2])
+
+    def live_values_fit(self):
+        """Whether the latest bar's price and indicator values stay inside the current limits"""
+        low, high = self.ax.get_ylim()
+        if not low <= self.prices[-1] <= high:
+            return False
+        for name, indicator in self.engine.indicators.items():
+            value = self.engine.values(name)[-1]
+            low, high = self.axes[indicator.panel].get_ylim()
+            if not np.isnan(value) and not low <= value <= high:
+                return False
+        return True
+
+    def build_chart(self, source, dates, prices, symbol, title, reset_engine=True):
+        """Create the axes, artists and styling for a new series"""
+        self.symbol, self.title = symbol, title
+        self.source, self.dates, self.prices = source, dates, prices
+        self.last_bar = source.bar(len(dates) - 1)
+        if reset_engine:
+            with span('chart.indicators', symbol=symbol, bars=len(dates)):
+                self.engine.initialize(source.to_frame())
+        self.build_axes()
+
+        # Plot the price line, decimated to roughly one point per pixel
+        self.price_line, = self.ax.plot([], [], label='Price', **LINE_STYLE)
+        self.live_line, = self.ax.plot([], [], animated=True, **LINE_STYLE)
+        self.live_marker, = self.ax.plot([], [], 'o', color='#2E86AB', markersize=5, animated=True)
+        self.create_indicator_artists()
+        self.redecimate(full_range=True)
+        self.set_live_data()
+        for ax in self.axes.values():
+            ax.xaxis_date()
+        # The axes are recreated per series, so connect zoom/pan handling each time
+        self.ax.callbacks.connect('xlim_changed', self.on_view_changed)
         
         # Customize the chart
-        self.ax.set_title(f'{symbol} - Stock Price Trend', fontsize=14, fontweight='bold')
-        self.ax.set_xlabel('Date', fontsize=10)
+        self.ax.set_title(title, fontsize=14, fontweight='bold')
         self.ax.set_ylabel('Price ($)', fontsize=10)
-        self.ax.grid(True, alpha=0.3)
+        if any(i.panel == 'price' for i in self.engine.indicators.values()):
+            self.ax.legend(loc='upper left', fontsize=8)
+        if 'rsi' in self.axes:
+            self.axes['rsi'].set_ylim(0, 100)
+            self.axes['rsi'].set_ylabel('RSI', fontsize=9)
+            for level in (30, 70):
+                self.axes['rsi'].axhline(level, color='gray', linestyle='--', linewidth=0.8, alpha=0.6)
+        if 'volume' in self.axes:
+            self.axes['volume'].set_ylabel('Volume', fontsize=9)
+        list(self.axes.values())[-1].set_xlabel('Date', fontsize=10)
+
+        for ax in self.axes.values():
+            ax.grid(True, alpha=0.3)
+            # Add some styling
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            if ax is not list(self.axes.values())[-1]:
+                ax.tick_params(labelbottom=False)
         
         # Format x-axis dates
         self.figure.autofmt_xdate()
         
-        # Add some styling
-        self.ax.spines['top'].set_visible(False)
-        self.ax.spines['right'].set_visible(False)
-        
-        # Tight layout to prevent clipping
-        self.figure.tight_layout()
+        self.autoscale()
         
-        # Refresh canvas
+        # Refresh canvas; the tight layout and rendering happen on the render thread
         self.canvas.draw()
+        
+    def create_indicator_artists(self):
+        """One animated artist per enabled indicator, on the axes of its panel"""
+        self.indicator_artists = {}
+        for name, indicator in self.engine.indicators.items():
+            ax = self.axes[indicator.panel]
+            color = INDICATOR_COLORS.get(name)
+            if indicator.panel == 'volume':
+                # Bars as vertical segments, so updating them is a single set_segments
+                artist = ax.vlines([], [], [], colors=color, linewidth=2, animated=True)
+            else:
+                artist, = ax.plot([], [], color=color, linewidth=1.2, label=name, animated=True)
+            self.indicator_artists[name] = artist
+
+    def redecimate(self, full_range=False):
+        """Fit the settled lines to the visible date range at about one point per pixel"""
+        x, y = self.dates[:-1], self.prices[:-1]
+        start, end = 0, len(x)
+        if not full_range:
+            # One extra point past each edge keeps the line running off the axes
+            low, high = self.ax.get_xlim()
+            start = max(int(np.searchsorted(x, low)) - 1, 0)
+            end = min(int(np.searchsorted(x, high)) + 1, len(x))
+        n_out = max(int(self.ax.bbox.width), MIN_PLOT_POINTS)
+        kept = start + lttb(x[start:end], y[start:end], n_out) if end > start else np.arange(0)
+        self.price_line.set_data(x[kept], y[kept])
+
+        # Indicators reuse the price line's kept bars, plus the live last bar
+        kept = np.append(kept, len(self.dates) - 1)
+        for name, artist in self.indicator_artists.items():
+            self.set_indicator_data(name, artist, self.dates[kept], self.engine.values(name)[kept])
+
+    def set_indicator_data(self, name, artist, x, values):
+        if self.engine.indicators[name].panel == 'volume':
+            segments = np.empty((len(x), 2, 2))
+            segments[:, :, 0] = x[:, None]
+            segments[:, 0, 1] = 0
+            segments[:, 1, 1] = values
+            artist.set_segments(segments)
+        else:
+            artist.set_data(x, values)
+
+    def set_indicator_last_values(self):
+        """A revised last bar only moves the final point of each indicator"""
+        for name, artist in self.indicator_artists.items():
+            value = self.engine.values(name)[-1]
+            if self.engine.indicators[name].panel == 'volume':
+                segments = artist.get_segments()
+                segments[-1][1, 1] = value
+                artist.set_segments(segments)
+            else:
+                values = np.array(artist.get_ydata(), dtype=float)
+                values[-1] = value
+                artist.set_ydata(values)
+
+    def on_view_changed(self, _=None):
+        """Zoom, pan or resize: re-decimate once the events settle"""
+        if self.price_line is None or self.redecimate_pending:
+            return
+        self.redecimate_pending = True
+        self.canvas.get_tk_widget().after_idle(self.canvas.run_when_idle, self.apply_view_change)
+
+    def apply_view_change(self):
+        self.redecimate_pending = False
+        if self.price_line is None:
+            return
+        self.redecimate()
+        self.canvas.draw_idle()
+
+    def set_live_data(self):
+        """Point the animated segment at the last two bars"""
+        self.live_line.set_data(self.dates[-2:], self.prices[-2:])
+        self.live_marker.set_data(self.dates[-1:], self.prices[-1:])
+
+    def autoscale(self):
+        self.ax.relim()
+        self.ax.autoscale_view()
+        if 'volume' in self.axes and 'Volume' in self.engine.series:
+            self.axes['volume'].set_ylim(0, max(np.nanmax(self.engine.values('Volume')), 1) * 1.1)
+
+    def rescale_and_draw(self):
+        """Rescale to the data and queue a full render"""
+        self.autoscale()
+        self.canvas.draw_idle()
+
+    def draw_animated(self):
+        self.ax.draw_artist(self.live_line)
+        self.ax.draw_artist(self.live_marker)
+        for artist in self.indicator_artists.values():
+            artist.axes.draw_artist(artist)
+
+    def on_draw(self, event):
+        """After a full draw, cache the static background and paint the live layer"""
+        if self.live_line is None:
+            self.background = None
+            return
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.draw_animated()
+
+    def blit_live(self):
+        """Repaint only the animated layer over the cached background"""
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        with span('chart.blit', symbol=self.symbol):
+            self.canvas.restore_region(self.background)
+            self.draw_animated()
+            self.canvas.blit(self.figure.bbox)
     
     def get_frame(self):
         """Return the frame widget"""
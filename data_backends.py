@@ -0,0 +1,264 @@
+import os
+import re
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+import pandas as pd
+from price_store import period_start
+
+# Google News RSS feeds, in English for India, 10 headlines per feed
+GOOGLE_NEWS_RSS = 'https://news.google.com/rss'
+GOOGLE_NEWS_LOCALE = {'hl': 'en-IN', 'gl': 'IN', 'ceid': 'IN:en'}
+NEWS_MAX_RESULTS = 10
+
+# Concurrent history requests behind one download(); the Yahoo rate limit is sized for it
+DOWNLOAD_THREADS = 8
+
+# Every backend implements the same calls:
+#   history(symbol, period=None, start=None, interval='1d') -> yfinance-style frame (DatetimeIndex)
+#   download(symbols, period)                               -> yf.download-style frame (field, symbol) columns
+#   news(query)                                             -> list of gnews article dicts
+#   topic_news(topic)                                       -> list of gnews article dicts for a feed topic
+#   warm_up()                                               -> load any slow clients ahead of time
+
+
+class LiveBackend:
+    """
+    Yahoo Finance for prices, Google News for headlines. Every call goes through one
+    rate-limited, pooled transport and raises DataSourceError once retries run out.
+    """
+
+    def __init__(self, rates=None):
+        # yfinance and feedparser are slow to import, so both load on first use
+        self._yf = None
+        self._feedparser = None
+        self._session = None
+        self._rates = rates
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                from transport import RateLimitedSession
+                self._session = RateLimitedSession(self._rates)
+            return self._session
+
+    @property
+    def yf(self):
+        with self._lock:
+            if self._yf is None:
+                import yfinance
+                self._yf = yfinance
+            return self._yf
+
+    @property
+    def feedparser(self):
+        with self._lock:
+            if self._feedparser is None:
+                import feedparser
+                self._feedparser = feedparser
+            return self._feedparser
+
+    def warm_up(self):
+        """Load both clients ahead of the first request"""
+        self.yf
+        self.feedparser
+        self.session
+
+    def _raise_if_failed(self, started, frame):
+        # yfinance logs transport errors and returns an empty frame; report them instead
+        if frame.empty:
+            error = self.session.failure_since(started)
+            if error is not None:
+                raise error
+        return frame
+
+    def history(self, symbol, period=None, start=None, interval='1d'):
+        started = time.monotonic()
+        ticker = self.yf.Ticker(symbol, session=self.session)
+        if start is not None:
+            return self._raise_if_failed(started, ticker.history(start=start, interval=interval))
+        return self._raise_if_failed(started, ticker.history(period=period, interval=interval))
+
+    def download(self, symbols, period):
+        """
+        One history request per symbol on a small pool, combined into a yf.download-style
+        (field, symbol) frame. Every request reports its own failure on its own thread, so
+        a symbol that fails is just missing; DataSourceError means every symbol failed.
+        """
+        from transport import DataSourceError
+        frames, errors = {}, []
+        with ThreadPoolExecutor(max_workers=max(1, min(DOWNLOAD_THREADS, len(symbols)))) as pool:
+            futures = [(symbol, pool.submit(self.history, symbol, period)) for symbol in symbols]
+            for symbol, future in futures:
+                try:
+                    frame = future.result()
+                except DataSourceError as e:
+                    errors.append(e)
+                    continue
+                if not frame.empty:
+                    # Exchanges differ in time zone; daily bars line up on their dates
+                    frames[symbol] = frame[['Open', 'High', 'Low', 'Close', 'Volume']].set_axis(
+                        frame.index.tz_localize(None).normalize())
+        if not frames:
+            if errors:
+                raise errors[0]
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+    def news(self, query):
+        return self._feed(f"{GOOGLE_NEWS_RSS}/search", q=query)
+
+    def topic_news(self, topic):
+        return self._feed(f"{GOOGLE_NEWS_RSS}/headlines/section/topic/{topic.upper()}")
+
+    def _feed(self, url, **params):
+        """
+        Fetch a Google News RSS feed through the session and return gnews-style article
+        dicts. feedparser never raises on a bad download, so it only parses the bytes.
+        """
+        from transport import DataSourceError
+        response = self.session.get(url, params={**params, **GOOGLE_NEWS_LOCALE}, timeout=10)
+        host = urlparse(url).hostname
+        if response.status_code != 200:
+            raise DataSourceError(host, 'http', f"HTTP {response.status_code}", response.status_code)
+        feed = self.feedparser.parse(response.content)
+        if feed.bozo and not feed.entries:
+            raise DataSourceError(host, 'http', f"unreadable feed: {feed.bozo_exception}")
+        return [{
+            'title': entry.get('title', ''),
+            'published date': entry.get('published', ''),
+            'url': entry.get('link', ''),
+            'publisher': {'title': entry.get('source', {}).get('title', ''),
+                          'href': entry.get('source', {}).get('href', '')},
+        } for entry in feed.entries[:NEWS_MAX_RESULTS]]
+
+
+def _fixture_name(text):
+    """File-system safe fixture name for a symbol or news query"""
+    return re.sub(r'[^A-Za-z0-9._^-]+', '_', text.strip()).upper()
+
+
+def _topic_fixture(topic):
+    """Feed topics are stored alongside query results under a prefixed name"""
+    return f"topic {topic}"
+
+
+class ReplayBackend:
+    """
+    Serves saved OHLCV frames and news payloads from a fixtures directory, so runs are
+    deterministic and work offline. `latency` adds a fixed delay per call to mimic the
+    network; with `shift_dates` the recorded bars are moved so the last one falls today.
+    """
+
+    def __init__(self, fixtures_dir, latency=0.0, shift_dates=True):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.shift_dates = shift_dates
+        self._frames = {}
+
+    def warm_up(self):
+        pass
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _frame(self, symbol):
+        if symbol not in self._frames:
+            path = os.path.join(self.fixtures_dir, "history", f"{_fixture_name(symbol)}.pkl")
+            if not os.path.exists(path):
+                self._frames[symbol] = pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+            else:
+                frame = pd.read_pickle(path)
+                if self.shift_dates and not frame.empty:
+                    today = pd.Timestamp(datetime.now().date(), tz=frame.index.tz)
+                    frame.index = frame.index + (today - frame.index[-1].normalize())
+                self._frames[symbol] = frame
+        return self._frames[symbol]
+
+    def history(self, symbol, period=None, start=None, interval='1d'):
+        self._wait()
+        frame = self._frame(symbol.upper())
+        if frame.empty:
+            return frame
+        naive_index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+        if start is not None:
+            return frame[naive_index >= pd.Timestamp(start)]
+        first = period_start(period) if period else None
+        return frame if first is None else frame[naive_index >= first]
+
+    def download(self, symbols, period):
+        self._wait()
+        frames = {s: self._frame(s.upper()) for s in symbols}
+        frames = {s: f for s, f in frames.items() if not f.empty}
+        if not frames:
+            return pd.DataFrame()
+        first = period_start(period)
+        combined = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+        naive_index = combined.index.tz_localize(None) if combined.index.tz is not None else combined.index
+        return combined[naive_index >= first]
+
+    def news(self, query):
+        self._wait()
+        path = os.path.join(self.fixtures_dir, "news", f"{_fixture_name(query)}.json")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    def topic_news(self, topic):
+        return self.news(_topic_fixture(topic))
+
+
+class RecordingBackend:
+    """Passes calls through to another backend and saves the results as replay fixtures."""
+
+    def __init__(self, inner, fixtures_dir):
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+        os.makedirs(os.path.join(fixtures_dir, "history"), exist_ok=True)
+        os.makedirs(os.path.join(fixtures_dir, "news"), exist_ok=True)
+
+    def warm_up(self):
+        self.inner.warm_up()
+
+    def history(self, symbol, period=None, start=None, interval='1d'):
+        frame = self.inner.history(symbol, period=period, start=start, interval=interval)
+        if not frame.empty and start is None:
+            frame.to_pickle(os.path.join(self.fixtures_dir, "history", f"{_fixture_name(symbol)}.pkl"))
+        return frame
+
+    def download(self, symbols, period):
+        return self.inner.download(symbols, period)
+
+    def news(self, query):
+        articles = self.inner.news(query)
+        self._save_news(query, articles)
+        return articles
+
+    def topic_news(self, topic):
+        articles = self.inner.topic_news(topic)
+        self._save_news(_topic_fixture(topic), articles)
+        return articles
+
+    def _save_news(self, query, articles):
+        with open(os.path.join(self.fixtures_dir, "news", f"{_fixture_name(query)}.json"), "w") as f:
+            json.dump(articles, f, default=str)
+
+
+def save_history_fixture(fixtures_dir, symbol, frame):
+    """Write an OHLCV frame where ReplayBackend will find it"""
+    os.makedirs(os.path.join(fixtures_dir, "history"), exist_ok=True)
+    frame.to_pickle(os.path.join(fixtures_dir, "history", f"{_fixture_name(symbol)}.pkl"))
+
+
+def save_news_fixture(fixtures_dir, query, articles):
+    """Write a gnews payload where ReplayBackend will find it"""
+    os.makedirs(os.path.join(fixtures_dir, "news"), exist_ok=True)
+    with open(os.path.join(fixtures_dir, "news", f"{_fixture_name(query)}.json"), "w") as f:
+        json.dump(articles, f)
@@ -0,0 +1,123 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+# Trading days before the event window used to estimate normal returns
+ESTIMATION_DAYS = 120
+
+
+def benchmark_for(symbol):
+    """Pick the market index used as the benchmark for a symbol"""
+    if symbol.upper().endswith('.NS'):
+        return '^NSEI'
+    if symbol.upper().endswith('.BO'):
+        return '^BSESN'
+    return '^GSPC'
+
+
+def log_returns(prices):
+    """Daily log returns aligned with prices (the first entry is NaN)"""
+    returns = np.full(len(prices), np.nan)
+    returns[1:] = np.diff(np.log(prices))
+    return returns
+
+
+def align_returns(dates, other_dates, other_prices):
+    """Benchmark log returns on the stock's trading dates (NaN where the index has no bar)"""
+    other_returns = log_returns(other_prices)
+    pos = np.searchsorted(other_dates, dates)
+    pos_clipped = np.minimum(pos, len(other_dates) - 1)
+    match = (pos < len(other_dates)) & (other_dates[pos_clipped] == dates)
+    return np.where(match, other_returns[pos_clipped], np.nan)
+
+
+def gather(values, index):
+    """values[index] with NaN wherever the index falls outside the series"""
+    valid = (index >= 0) & (index < len(values))
+    return np.where(valid, values[np.clip(index, 0, len(values) - 1)], np.nan)
+
+
+def run_event_study(dates, prices, event_dates, before=5, after=10,
+                    benchmark_dates=None, benchmark_prices=None, estimation_days=ESTIMATION_DAYS):
+    """
+    Abnormal returns around every event in one vectorized pass.
+
+    All events are laid out as rows of (events x window) matrices. Normal returns come
+    from a market model fitted on each event's estimation window when a benchmark is
+    given, otherwise from that window's mean return.
+
+    Returns (events, curve): a per-event frame and the average cumulative abnormal
+    return by day offset. A window with any missing day (past the last bar, before the
+    first, or without enough estimation history) is NaN rather than a partial sum, and
+    the curve averages, at each offset, only the events with data up to it.
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    returns = log_returns(np.asarray(prices, dtype=float))
+    event_days = np.asarray(event_dates, dtype='datetime64[D]')
+
+    # Events on non-trading days count from the next session
+    event_index = np.searchsorted(dates, event_days)
+    in_range = event_index < len(dates)
+    event_index = event_index[in_range]
+
+    offsets = np.arange(-before, after + 1)
+    window = event_index[:, None] + offsets
+    window_returns = gather(returns, window)
+
+    estimation = event_index[:, None] + np.arange(-before - estimation_days, -before)
+    estimation_returns = gather(returns, estimation)
+
+    if benchmark_dates is not None:
+        market = align_returns(dates, np.asarray(benchmark_dates, dtype='datetime64[D]'),
+                               np.asarray(benchmark_prices, dtype=float))
+        market_window = gather(market, window)
+        market_estimation = gather(market, estimation)
+
+        # Per-event OLS of stock returns on market returns, ignoring missing days
+        usable = ~np.isnan(estimation_returns) & ~np.isnan(market_estimation)
+        x = np.where(usable, market_estimation, np.nan)
+        y = np.where(usable, estimation_returns, np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            # Events without enough history give empty slices; their results are simply NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            x_dev = x - np.nanmean(x, axis=1, keepdims=True)
+            y_dev = y - np.nanmean(y, axis=1, keepdims=True)
+            beta = np.nansum(x_dev * y_dev, axis=1) / np.nansum(x_dev ** 2, axis=1)
+            alpha = np.nanmean(y, axis=1) - beta * np.nanmean(x, axis=1)
+        expected = alpha[:, None] + beta[:, None] * market_window
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            expected = np.nanmean(estimation_returns, axis=1, keepdims=True)
+        beta = np.full(len(event_index), np.nan)
+
+    abnormal = window_returns - expected
+    pre, post = offsets < 0, offsets >= 0
+
+    # Plain sums: one missing day makes the whole window NaN instead of counting as 0%
+    events = pd.DataFrame({
+        'date': dates[event_index],
+        'pre_return': np.expm1(window_returns[:, pre].sum(axis=1)) * 100,
+        'post_return': np.expm1(window_returns[:, post].sum(axis=1)) * 100,
+        'pre_car': abnormal[:, pre].sum(axis=1) * 100,
+        'post_car': abnormal[:, post].sum(axis=1) * 100,
+        'beta': beta,
+    })
+    events.index = np.flatnonzero(in_range)
+
+    # Average cumulative abnormal return, anchored at the start of the window; an
+    # event's CAR stops at its first missing day, so each offset has its own count
+    car = np.cumsum(abnormal, axis=1) * 100
+    count = (~np.isnan(car)).sum(axis=0)
+    with warnings.catch_warnings():
+        # Offsets no event reaches are simply NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean_car = np.nanmean(car, axis=0)
+        stderr = np.nanstd(car, axis=0) / np.sqrt(count)
+    curve = pd.DataFrame({
+        'offset': offsets,
+        'mean_car': mean_car,
+        'stderr': stderr,
+        'events': count,
+    })
+    return events, curve
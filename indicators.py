@@ -0,0 +1,233 @@
+from collections import deque
+import numpy as np
+
+
+class GrowableArray:
+    """float64 buffer with amortized O(1) append; `view()` is a zero-copy slice."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        self.size = len(values)
+        self.buffer = np.empty(max(16, self.size * 2))
+        self.buffer[:self.size] = values
+
+    def append(self, value):
+        if self.size == len(self.buffer):
+            grown = np.empty(len(self.buffer) * 2)
+            grown[:self.size] = self.buffer[:self.size]
+            self.buffer = grown
+        self.buffer[self.size] = value
+        self.size += 1
+
+    def set_last(self, value):
+        self.buffer[self.size - 1] = value
+
+    def view(self):
+        return self.buffer[:self.size]
+
+
+# Each indicator computes its full history with vectorized pandas/NumPy in `initialize`,
+# then keeps just enough rolling state to handle a new bar (`append`) or a revised
+# last bar (`replace_last`) in O(1). `panel` says where the chart draws it.
+
+class SMA:
+    panel = 'price'
+
+    def __init__(self, window):
+        self.window = window
+        self.label = f'SMA {window}'
+
+    def initialize(self, frame):
+        close = frame['Close'].astype(float)
+        self.values = deque(close.iloc[-self.window:], maxlen=self.window)
+        self.total = float(sum(self.values))
+        return close.rolling(self.window).mean().to_numpy()
+
+    def current(self):
+        return self.total / self.window if len(self.values) == self.window else np.nan
+
+    def append(self, bar):
+        close = float(bar['Close'])
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(close)
+        self.total += close
+        return self.current()
+
+    def replace_last(self, bar):
+        close = float(bar['Close'])
+        self.total += close - self.values[-1]
+        self.values[-1] = close
+        return self.current()
+
+
+class EMA:
+    panel = 'price'
+
+    def __init__(self, window):
+        self.window = window
+        self.alpha = 2 / (window + 1)
+        self.label = f'EMA {window}'
+
+    def initialize(self, frame):
+        values = frame['Close'].astype(float).ewm(span=self.window, adjust=False).mean().to_numpy()
+        # EMA before the last bar, so a revised last bar can be recomputed
+        self.previous = values[-2] if len(values) > 1 else np.nan
+        self.last = values[-1]
+        return values
+
+    def step(self, close):
+        if np.isnan(self.previous):
+            return close
+        return self.alpha * close + (1 - self.alpha) * self.previous
+
+    def append(self, bar):
+        self.previous = self.last
+        self.last = self.step(float(bar['Close']))
+        return self.last
+
+    def replace_last(self, bar):
+        self.last = self.step(float(bar['Close']))
+        return self.last
+
+
+class RSI:
+    """Wilder's RSI: exponential averages of gains and losses with alpha = 1 / window."""
+    panel = 'rsi'
+
+    def __init__(self, window=14):
+        self.window = window
+        self.label = f'RSI {window}'
+
+    def initialize(self, frame):
+        close = frame['Close'].astype(float)
+        delta = close.diff()
+        gains = delta.clip(lower=0).ewm(alpha=1 / self.window, adjust=False).mean().to_numpy()
+        losses = (-delta).clip(lower=0).ewm(alpha=1 / self.window, adjust=False).mean().to_numpy()
+
+        closes = close.to_numpy()
+        self.close_before = closes[-2] if len(closes) > 1 else np.nan
+        self.close_last = closes[-1]
+        self.gain_before, self.loss_before = (gains[-2], losses[-2]) if len(closes) > 1 else (np.nan, np.nan)
+        self.gain_last, self.loss_last = gains[-1], losses[-1]
+        return self.rsi(gains, losses)
+
+    @staticmethod
+    def rsi(gain, loss):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
+
+    def step(self, close):
+        delta = close - self.close_before
+        if np.isnan(self.gain_before):
+            # First delta seeds the averages
+            return max(delta, 0), max(-delta, 0)
+        gain = self.gain_before + (max(delta, 0) - self.gain_before) / self.window
+        loss = self.loss_before + (max(-delta, 0) - self.loss_before) / self.window
+        return gain, loss
+
+    def append(self, bar):
+        self.close_before, self.gain_before, self.loss_before = self.close_last, self.gain_last, self.loss_last
+        self.close_last = float(bar['Close'])
+        self.gain_last, self.loss_last = self.step(self.close_last)
+        return float(self.rsi(self.gain_last, self.loss_last))
+
+    def replace_last(self, bar):
+        self.close_last = float(bar['Close'])
+        self.gain_last, self.loss_last = self.step(self.close_last)
+        return float(self.rsi(self.gain_last, self.loss_last))
+
+
+class VWAP:
+    """Volume-weighted average price anchored at the first loaded bar."""
+    panel = 'price'
+    label = 'VWAP'
+
+    def initialize(self, frame):
+        typical = ((frame['High'] + frame['Low'] + frame['Close']) / 3).to_numpy(dtype=float)
+        volume = frame['Volume'].to_numpy(dtype=float)
+        cum_pv = np.cumsum(typical * volume)
+        cum_v = np.cumsum(volume)
+        self.pv_before = cum_pv[-2] if len(cum_pv) > 1 else 0.0
+        self.v_before = cum_v[-2] if len(cum_v) > 1 else 0.0
+        self.pv_last, self.v_last = cum_pv[-1], cum_v[-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return cum_pv / cum_v
+
+    def step(self, bar):
+        typical = (float(bar['High']) + float(bar['Low']) + float(bar['Close'])) / 3
+        volume = float(bar['Volume'])
+        self.pv_last = self.pv_before + typical * volume
+        self.v_last = self.v_before + volume
+        return self.pv_last / self.v_last if self.v_last else np.nan
+
+    def append(self, bar):
+        self.pv_before, self.v_before = self.pv_last, self.v_last
+        return self.step(bar)
+
+    def replace_last(self, bar):
+        return self.step(bar)
+
+
+class Volume:
+    panel = 'volume'
+    label = 'Volume'
+
+    def initialize(self, frame):
+        return frame['Volume'].to_numpy(dtype=float)
+
+    def append(self, bar):
+        return float(bar['Volume'])
+
+    def replace_last(self, bar):
+        return float(bar['Volume'])
+
+
+# Indicators offered by the chart, in toggle order
+AVAILABLE_INDICATORS = {
+    'SMA 20': lambda: SMA(20),
+    'SMA 50': lambda: SMA(50),
+    'EMA 20': lambda: EMA(20),
+    'VWAP': VWAP,
+    'RSI 14': lambda: RSI(14),
+    'Volume': Volume,
+}
+
+
+class IndicatorEngine:
+    """Keeps a configurable set of indicators in step with an OHLCV series."""
+
+    def __init__(self, names=()):
+        self.indicators = {name: AVAILABLE_INDICATORS[name]() for name in names}
+        self.series = {}
+        self.last_date = None
+
+    def add(self, name, frame=None):
+        self.indicators[name] = AVAILABLE_INDICATORS[name]()
+        if frame is not None and not frame.empty:
+            self.series[name] = GrowableArray(self.indicators[name].initialize(frame))
+
+    def remove(self, name):
+        self.indicators.pop(name, None)
+        self.series.pop(name, None)
+
+    def initialize(self, frame):
+        """Vectorized computation over the full history"""
+        self.series = {name: GrowableArray(indicator.initialize(frame))
+                       for name, indicator in self.indicators.items()}
+        self.last_date = frame['date'].iloc[-1]
+
+    def update(self, bar):
+        """O(1) per indicator: a new bar is appended, a bar for the last date replaces it"""
+        if self.last_date is not None and bar['date'] < self.last_date:
+            return
+        replace = bar['date'] == self.last_date
+        for name, indicator in self.indicators.items():
+            if replace:
+                self.series[name].set_last(indicator.replace_last(bar))
+            else:
+                self.series[name].append(indicator.append(bar))
+        self.last_date = bar['date']
+
+    def values(self, name):
+        return self.series[name].view()
@@ -1,11 +1,36 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import threading
 import time
-from stock_data import StockDataProvider
-from chart_widget import ChartWidget
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+# Only light, Tk-only modules are imported up front; pandas, matplotlib, yfinance and
+# feedparser are loaded on a background thread once the first frame is on screen
 from news_widget import NewsWidget
-from news_analysis_window import NewsAnalysisWindow # Import the new window
+from watchlist_widget import WatchlistWidget
+from refresh_scheduler import RefreshScheduler
+from cancellation import Generations, Cancelled
+from tracing import tracer, span
+
+# Set by benchmarks/bench_startup.py: print startup milestones and exit when ready
+STARTUP_PROBE = os.environ.get("STOCKSIGHT_STARTUP_PROBE") == "1"
+
+# Refresh intervals in seconds: (while NSE is open, while it is closed)
+REFRESH_INTERVALS = {
+    'symbol': (30, 900),
+    'watchlist': (60, 1800),
+    'market_news': (600, 3600),
+}
+
+# Intraday mode polls once per 1-minute bar while NSE is open
+INTRADAY_INTERVALS = (60, 1800)
+
+# Seconds to wait for each data source before giving up on it
+SOURCE_TIMEOUTS = {
+    'quote': 15,
+    'history': 20,
+    'news': 15,
+}
 
 class StockMarketViewer:
     def __init__(self):
@@ -14,15 +39,33 @@ class StockMarketViewer:
         self.root.geometry("1200x800")
         self.root.configure(bg='#f0f0f0')
         
-        # Initialize data provider
-        self.stock_data = StockDataProvider()
+        # Data provider and chart are created by finish_startup, after the heavy imports
+        self.stock_data = None
+        self.chart_widget = None
+        self.ready = False
+        self.pending_symbol = None
+        # Bounded pool shared by every fetch, so the quote, history and news run in parallel
+        self.fetch_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="fetch")
+        # Symbol loads run one at a time; each new search cancels the one before it
+        self.load_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="load")
+        self.loads = Generations()
         
         # Current stock being viewed
         self.current_symbol = None
-        self.auto_refresh = False
+        # Intraday mode streams 1-minute bars from a fixed-size (symbol, BarRingBuffer)
+        self.intraday_mode = False
+        self.intraday_buffer = None
         
         # Setup GUI
         self.setup_gui()
+
+        # One scheduler owns every periodic refresh
+        self.scheduler = RefreshScheduler()
+        self.scheduler.add_job('symbol', self.refresh_current_symbol, *REFRESH_INTERVALS['symbol'])
+        self.scheduler.add_job('watchlist', self.watchlist_widget.refresh_now, *REFRESH_INTERVALS['watchlist'])
+        self.scheduler.add_job('market_news', self.refresh_market_news, *REFRESH_INTERVALS['market_news'])
+        self.scheduler.add_job('intraday', self.poll_intraday, *INTRADAY_INTERVALS)
+        self.scheduler.start()
         
         # Start the application
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -39,9 +82,26 @@ class StockMarketViewer:
         main_frame.columnconfigure(1, weight=2) # Give less weight to right panel
         main_frame.rowconfigure(1, weight=1)
         
+        self.setup_menu()
         self.setup_search_section(main_frame)
         self.setup_content_area(main_frame)
         self.setup_status_bar() # Pass root instead of main_frame for correct grid placement
+
+    def setup_menu(self):
+        """Setup the menu bar"""
+        menubar = tk.Menu(self.root)
+        tools_menu = tk.Menu(menubar, tearoff=0)
+
+        # Timing spans for fetch/transform/render stages
+        self.tracing_var = tk.BooleanVar(value=tracer.enabled)
+        tools_menu.add_checkbutton(label="Enable Tracing", variable=self.tracing_var,
+                                   command=self.toggle_tracing)
+        tools_menu.add_command(label="Export Trace...", command=self.export_trace)
+        tools_menu.add_separator()
+        tools_menu.add_command(label="Stock Screener...", command=self.open_screener)
+
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        self.root.config(menu=menubar)
         
     def setup_search_section(self, parent):
         """Setup stock search section"""
@@ -61,13 +121,23 @@ class StockMarketViewer:
         self.search_btn.grid(row=0, column=2, padx=(0, 10))
         
         self.auto_refresh_var = tk.BooleanVar()
-        self.auto_refresh_cb = ttk.Checkbutton(search_frame, text="Auto Refresh (30s)", 
+        self.auto_refresh_cb = ttk.Checkbutton(search_frame, text="Auto Refresh", 
                                               variable=self.auto_refresh_var,
                                               command=self.toggle_auto_refresh)
         self.auto_refresh_cb.grid(row=0, column=3, padx=(20, 0))
+
+        self.intraday_var = tk.BooleanVar()
+        self.intraday_cb = ttk.Checkbutton(search_frame, text="Intraday (1m)",
+                                           variable=self.intraday_var,
+                                           command=self.toggle_intraday)
+        self.intraday_cb.grid(row=0, column=4, padx=(10, 0))
+
+        # Event study over every headline for the current symbol
+        self.impact_btn = ttk.Button(search_frame, text="News Impact", command=self.open_news_impact)
+        self.impact_btn.grid(row=0, column=5, padx=(20, 0))
         
         popular_frame = ttk.Frame(search_frame)
-        popular_frame.grid(row=1, column=0, columnspan=4, pady=(10, 0), sticky=tk.W)
+        popular_frame.grid(row=1, column=0, columnspan=6, pady=(10, 0), sticky=tk.W)
         
         ttk.Label(popular_frame, text="Popular (India):").pack(side=tk.LEFT, padx=(0, 5))
         
@@ -92,25 +162,113 @@ class StockMarketViewer:
         chart_frame.rowconfigure(0, weight=1)
         chart_frame.columnconfigure(0, weight=1)
         
-        self.chart_widget = ChartWidget(chart_frame)
-        self.chart_widget.get_frame().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Placeholder until matplotlib has loaded in the background
+        self.chart_frame = chart_frame
+        self.chart_placeholder = ttk.Label(chart_frame, text="Loading chart engine...", anchor=tk.CENTER)
+        self.chart_placeholder.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        right_panel = ttk.LabelFrame(parent, text="Market News", padding="5")
-        right_panel.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # Right side holds the news feed and the watchlist as tabs
+        right_notebook = ttk.Notebook(parent)
+        right_notebook.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        right_panel = ttk.Frame(right_notebook, padding="5")
         right_panel.rowconfigure(0, weight=1)
         right_panel.columnconfigure(0, weight=1)
+        right_notebook.add(right_panel, text="Market News")
 
         # Pass the callback function to the NewsWidget
-        self.news_widget = NewsWidget(right_panel, self.open_news_analysis)
+        self.news_widget = NewsWidget(right_panel, self.open_news_analysis, self.search_news)
         self.news_widget.get_frame().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
+        watchlist_panel = ttk.Frame(right_notebook, padding="5")
+        watchlist_panel.rowconfigure(0, weight=1)
+        watchlist_panel.columnconfigure(0, weight=1)
+        right_notebook.add(watchlist_panel, text="Watchlist")
+
+        self.watchlist_widget = WatchlistWidget(watchlist_panel, self.stock_data, self.quick_search, self.fetch_pool)
+        self.watchlist_widget.get_frame().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+    def warm_up(self):
+        """Background thread: import the heavy libraries and build the data provider"""
+        try:
+            with span('startup.imports'):
+                import stock_data
+                import chart_widget  # noqa: F401  (pulls in matplotlib's TkAgg backend)
+                import news_analysis_window  # noqa: F401
+                import news_impact_window  # noqa: F401
+            with span('startup.provider'):
+                provider = stock_data.StockDataProvider()
+            self.root.after(0, self.finish_startup, provider)
+            # yfinance and feedparser load last; the first search will not need to wait for them
+            provider.backend.warm_up()
+        except Exception as e:
+            # Formatted here: `e` is gone once the except block ends
+            self.root.after(0, self.startup_failed, f"Startup error: {e}")
+
+    def startup_failed(self, message):
+        """Main thread: show why startup failed in place of the loading placeholder"""
+        self.status_var.set(message)
+        if not self.ready:
+            self.chart_placeholder.config(text=f"{message}\n\nRestart StockSight to try again.",
+                                          foreground='red')
+
+    def finish_startup(self, provider):
+        """Main thread: swap the placeholder for the chart and enable data loading"""
+        from chart_widget import ChartWidget
+
+        self.stock_data = provider
+        self.watchlist_widget.stock_data_provider = provider
+
+        self.chart_placeholder.destroy()
+        self.chart_widget = ChartWidget(self.chart_frame)
+        self.chart_widget.get_frame().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.ready = True
+        self.watchlist_widget.refresh()
+        if self.pending_symbol:
+            self.quick_search(self.pending_symbol)
+        if STARTUP_PROBE:
+            print(f"ready {time.time():.6f}", flush=True)
+            self.root.after(0, self.on_closing)
+
+    def on_first_frame(self):
+        """Runs once the window has been painted"""
+        if STARTUP_PROBE:
+            print(f"first_frame {time.time():.6f}", flush=True)
+        threading.Thread(target=self.warm_up, name="warm-up", daemon=True).start()
+
     def open_news_analysis(self, news_item):
         """Callback function to open the news analysis window."""
+        from news_analysis_window import NewsAnalysisWindow
+        # The list can hold headlines for earlier symbols too
+        symbol = news_item.get('symbol', self.current_symbol)
+        if symbol:
+            NewsAnalysisWindow(self.root, symbol, news_item, self.stock_data)
+        else:
+            messagebox.showinfo("Info", "No stock selected.")
+
+    def search_news(self, text):
+        """Keyword search over the local headline archive; never touches the network"""
+        if not self.ready:
+            return []
+        return self.stock_data.search_news(text)
+
+    def open_news_impact(self):
+        """Open the batch news impact (event study) window."""
+        from news_impact_window import NewsImpactWindow
         if self.current_symbol:
-            NewsAnalysisWindow(self.root, self.current_symbol, news_item, self.stock_data)
+            NewsImpactWindow(self.root, self.current_symbol, self.stock_data)
         else:
             messagebox.showinfo("Info", "No stock selected.")
     
+    def open_screener(self):
+        """Open the multi-symbol screener over the cached universe."""
+        from screener_window import ScreenerWindow
+        if self.ready:
+            ScreenerWindow(self.root, self.stock_data, self.quick_search)
+        else:
+            messagebox.showinfo("Info", "Still starting up, try again in a moment.")
+
     def setup_stock_info(self, parent):
         """Setup stock information display"""
         info_frame = ttk.LabelFrame(parent, text="Stock Information", padding="10")
@@ -154,37 +312,133 @@ class StockMarketViewer:
             messagebox.showwarning("Warning", "Please enter a stock symbol.")
             return
             
+        if not self.ready:
+            # Still loading libraries; run this search as soon as startup finishes
+            self.pending_symbol = symbol
+            self.status_var.set(f"Starting up... {symbol} will load in a moment.")
+            return
+
         self.current_symbol = symbol
         self.status_var.set(f"Loading data for {symbol}...")
         
-        threading.Thread(target=self.load_stock_data, args=(symbol,), daemon=True).start()
+        self.load_pool.submit(self.load_stock_data, symbol, True, self.loads.next())
+        if self.intraday_mode:
+            self.scheduler.set_enabled('intraday', True, run_now=True)
     
     def quick_search(self, symbol):
         """Quick search for popular stocks"""
         self.symbol_var.set(symbol)
         self.search_stock()
     
-    def load_stock_data(self, symbol):
-        """Load stock data in background thread"""
+    def load_stock_data(self, symbol, show_errors=True, token=None):
+        """Load stock data in background thread, rendering each panel as soon as its data arrives.
+        Returns True if the quote loaded; a load whose token is cancelled stops and shows nothing."""
+        token = token or self.loads.next()
+        if token.cancelled:
+            return True
+        with span('load_stock_data', symbol=symbol, generation=token.generation):
+            return self.load_sources(symbol, show_errors, token)
+
+    def traced_fetch(self, name, fetch, symbol, timings, token):
+        """Run one source's fetch inside a tracing span, noting how long it took"""
+        # A fetch that was queued behind a superseded load never touches the network
+        token.raise_if_cancelled()
+        with span(f'load.{name}', symbol=symbol) as timing:
+            result = fetch(symbol)
+        timings[name] = timing.duration
+        return result
+
+    def post(self, token, fn, *args):
+        """Run fn(*args) on the Tk thread, unless the load it belongs to has been superseded by then"""
+        if token.cancelled:
+            return
+        self.root.after(0, lambda: None if token.cancelled else fn(*args))
+
+    def load_sources(self, symbol, show_errors, token):
+        from transport import DataSourceError
         try:
-            stock_info = self.stock_data.get_stock_price(symbol)
-            
-            if stock_info:
-                self.root.after(0, self.update_stock_info, stock_info)
-                
-                historical_data = self.stock_data.get_historical_data(symbol)
-                self.root.after(0, self.chart_widget.update_chart, historical_data, symbol)
-                
-                news_data = self.stock_data.get_stock_news(symbol)
-                self.root.after(0, self.news_widget.update_news, news_data, symbol)
-                
-                self.root.after(0, lambda: self.status_var.set(f"Displaying data for {symbol} | All data from Yahoo Finance."))
+            sources = {
+                'quote': (self.stock_data.get_stock_price, self.update_stock_info),
+                'history': (self.stock_data.get_historical_data,
+                            lambda data: self.chart_widget.update_chart(data, symbol)),
+                'news': (self.stock_data.get_stock_news,
+                         lambda data: self.news_widget.update_news(data, symbol)),
+            }
+            if self.intraday_mode:
+                # The chart is streaming 1-minute bars instead
+                del sources['history']
+            started = time.monotonic()
+            timings = {}
+            futures = {self.fetch_pool.submit(self.traced_fetch, name, fetch, symbol, timings, token): name
+                       for name, (fetch, _) in sources.items()}
+            pending = set(futures)
+            failed = []
+            source_error = None
+            stale = None
+
+            while pending:
+                deadline = min(started + SOURCE_TIMEOUTS[futures[f]] for f in pending)
+                # The token's signal wakes this up as soon as a newer load starts
+                done, pending = wait(pending | {token.signal}, timeout=max(0, deadline - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+                pending.discard(token.signal)
+                if token.cancelled:
+                    # Fetches that have not started yet never will; running ones finish unseen
+                    for future in pending:
+                        future.cancel()
+                    return True
+                for future in done - {token.signal}:
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except Cancelled:
+                        continue
+                    except DataSourceError as e:
+                        # Rate limited or unreachable after retries: say so rather than "no data"
+                        print(f"Error loading {name} for {symbol}: {e}")
+                        failed.append(f"{name} ({e.kind.replace('_', ' ')})")
+                        source_error = source_error or e
+                        continue
+                    except Exception as e:
+                        print(f"Error loading {name} for {symbol}: {e}")
+                        failed.append(name)
+                        continue
+                    if name == 'quote' and not result:
+                        failed.append(name)
+                        continue
+                    if name == 'quote':
+                        stale = result.get('stale')
+                    self.post(token, sources[name][1], result)
+
+                # Give up on any source that has used up its own timeout
+                for future in [f for f in pending if time.monotonic() >= started + SOURCE_TIMEOUTS[futures[f]]]:
+                    future.cancel()
+                    pending.discard(future)
+                    failed.append(f"{futures[future]} (timed out)")
+
+            if token.cancelled:
+                return True
+            if any(name.startswith('quote') for name in failed) and source_error is not None:
+                self.post(token, self.status_var.set, f"Failed to load data for {symbol}: {source_error.user_message}")
+                if show_errors:
+                    messagebox.showerror("Error", source_error.user_message)
+                return False
+            elif any(name.startswith('quote') for name in failed):
+                self.post(token, self.status_var.set, f"Failed to load data for {symbol}. Check the symbol and try again.")
+                if show_errors:
+                    messagebox.showerror("Error", f"Could not find data for symbol '{symbol}'.\nFor Indian stocks, use the '.NS' (NSE) or '.BO' (BSE) suffix.")
+                return False
+            elif stale is not None:
+                self.post(token, self.status_var.set, f"Displaying stored data for {symbol} | Could not update: {stale.user_message}")
+            elif failed:
+                self.post(token, self.status_var.set, f"Displaying data for {symbol} | Unavailable: {', '.join(failed)}")
             else:
-                self.root.after(0, lambda: self.status_var.set(f"Failed to load data for {symbol}. Check the symbol and try again."))
-                messagebox.showerror("Error", f"Could not find data for symbol '{symbol}'.\nFor Indian stocks, use the '.NS' (NSE) or '.BO' (BSE) suffix.")
-                
+                self.post(token, self.status_var.set, f"Displaying data for {symbol} | All data from Yahoo Finance.{self.timing_readout(timings)}")
+            return True
+
         except Exception as e:
-            self.root.after(0, lambda: self.status_var.set(f"Error: {str(e)}"))
+            self.post(token, self.status_var.set, f"Error: {str(e)}")
+            return False
     
     def update_stock_info(self, stock_info):
         """Update stock information display"""
@@ -198,30 +452,120 @@ class StockMarketViewer:
         self.info_labels['volume'].config(text=f"{int(stock_info['volume']):,}")
         self.info_labels['updated'].config(text=stock_info['last_updated'])
     
+    def timing_readout(self, timings):
+        """Per-source load times for the status bar, while tracing is on"""
+        if not tracer.enabled:
+            return ""
+        parts = [f"{name} {duration * 1000:.0f} ms" for name, duration in timings.items() if duration is not None]
+        return " | " + ", ".join(parts) if parts else ""
+
+    def toggle_tracing(self):
+        """Turn timing spans on or off"""
+        tracer.enabled = self.tracing_var.get()
+        self.status_var.set("Tracing enabled." if tracer.enabled else "Tracing disabled.")
+
+    def export_trace(self):
+        """Save the recent spans as a Chrome trace (or plain JSON)"""
+        if not tracer.recent():
+            messagebox.showinfo("Info", "No spans recorded yet. Enable tracing and load a stock first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json"), ("Plain JSON", "*.spans.json")])
+        if not path:
+            return
+        if path.endswith(".spans.json"):
+            tracer.export_json(path)
+        else:
+            tracer.export_chrome_trace(path)
+        self.status_var.set(f"Trace written to {path}")
+
     def toggle_auto_refresh(self):
         """Toggle auto-refresh functionality"""
-        self.auto_refresh = self.auto_refresh_var.get()
-        if self.auto_refresh and self.current_symbol:
-            self.status_var.set(f"Auto-refresh enabled for {self.current_symbol}. Updating every 30 seconds.")
-            threading.Thread(target=self.auto_refresh_loop, daemon=True).start()
+        enabled = self.auto_refresh_var.get()
+        for job in REFRESH_INTERVALS:
+            self.scheduler.set_enabled(job, enabled)
+        if enabled:
+            target = self.current_symbol or "the watchlist"
+            self.status_var.set(f"Auto-refresh enabled for {target}. Polling faster while NSE is open.")
         else:
             self.status_var.set(f"Auto-refresh disabled.")
 
-    def auto_refresh_loop(self):
-        """Auto-refresh loop"""
-        while self.auto_refresh and self.current_symbol:
-            time.sleep(30)
-            if self.auto_refresh and self.current_symbol:
-                # Use load_stock_data directly to avoid UI pop-ups on failure
-                threading.Thread(target=self.load_stock_data, args=(self.current_symbol,), daemon=True).start()
+    def toggle_intraday(self):
+        """Switch the chart between daily closes and streaming 1-minute bars"""
+        self.intraday_mode = self.intraday_var.get()
+        self.scheduler.set_enabled('intraday', self.intraday_mode, run_now=True)
+        if self.intraday_mode:
+            self.status_var.set("Intraday mode: polling 1-minute bars every minute while NSE is open.")
+        else:
+            self.intraday_buffer = None
+            if self.current_symbol:
+                # Back to the daily chart
+                self.quick_search(self.current_symbol)
+
+    def poll_intraday(self):
+        """Scheduler job: merge the newest 1-minute bars into the ring buffer and stream them to the chart"""
+        symbol = self.current_symbol
+        if not symbol or not self.ready or not self.intraday_mode:
+            return True
+        from tick_buffer import BarRingBuffer
+
+        if self.intraday_buffer is None or self.intraday_buffer[0] != symbol:
+            self.intraday_buffer = (symbol, BarRingBuffer())
+        buffer = self.intraday_buffer[1]
+
+        # After the first poll only the bars since the last one are requested
+        bars = self.stock_data.get_intraday_bars(symbol, since=buffer.last_time)
+        if bars.empty and not len(buffer):
+            return False
+        buffer.extend(bars)
+        self.root.after(0, self.show_intraday, symbol, buffer)
+        return True
+
+    def show_intraday(self, symbol, buffer):
+        """Main thread: draw the buffer unless the user has moved on"""
+        if not self.intraday_mode or symbol != self.current_symbol:
+            return
+        self.chart_widget.update_intraday(buffer, symbol)
+        self.status_var.set(f"Streaming {symbol} 1-minute bars | {len(buffer)} bars")
+
+    def refresh_market_news(self):
+        """Scheduler job: tag the general market feeds to the watchlist and current symbol"""
+        if not self.ready:
+            return True
+        symbol = self.current_symbol
+        symbols = list(self.watchlist_widget.symbols) + ([symbol] if symbol else [])
+        counts = self.stock_data.ingest_market_news(symbols)
+        if counts is None:
+            return False
+        if symbol and counts.get(symbol):
+            from stock_data import NEWS_PANEL_LIMIT
+            news = self.stock_data.get_archived_news(symbol, limit=NEWS_PANEL_LIMIT)
+            self.root.after(0, self.news_widget.update_news, news, symbol)
+        return True
+
+    def refresh_current_symbol(self):
+        """Scheduler job: reload whatever symbol is on screen, without error pop-ups"""
+        # Shares the current search's token, so switching symbols cancels the refresh too.
+        # The token is read first: a search sets the symbol before it replaces the token.
+        token = self.loads.current
+        symbol = self.current_symbol
+        if not symbol or not self.ready or token is None:
+            return True
+        return self.load_stock_data(symbol, show_errors=False, token=token)
     
     def on_closing(self):
         """Handle application closing"""
-        self.auto_refresh = False
+        self.scheduler.stop()
+        if self.loads.current is not None:
+            self.loads.current.cancel()
+        self.load_pool.shutdown(wait=False, cancel_futures=True)
+        self.fetch_pool.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
     
     def run(self):
         """Start the application"""
+        # Heavy imports start only after the window is on screen
+        self.root.after_idle(self.on_first_frame)
         self.root.mainloop()
 
 if __name__ == "__main__":
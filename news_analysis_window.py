@@ -1,9 +1,14 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+import numpy as np
 import pandas as pd
-from datetime import timedelta
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from offscreen_canvas import OffscreenCanvasTkAgg
+from tracing import span
+from transport import DataSourceError
+
+# Minimum time between redraws while a slider is dragged (about one frame at 60 Hz)
+FRAME_MS = 16
 
 class NewsAnalysisWindow(tk.Toplevel):
     def __init__(self, parent, symbol, news_item, stock_data_provider):
@@ -17,6 +22,14 @@ class NewsAnalysisWindow(tk.Toplevel):
         self.geometry("800x600")
 
         self.historical_data = None
+        self.dates = None
+        self.prices = None
+        self.price_line = None
+        # Other archived headlines for the symbol, snapped to trading days
+        self.headline_dates = None
+        self.headline_prices = None
+        self.headline_markers = None
+        self.update_pending = False
         
         self.setup_ui()
         self.load_data_and_plot()
@@ -33,9 +46,10 @@ class NewsAnalysisWindow(tk.Toplevel):
         news_title_label.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
         
         # Matplotlib Chart
-        self.figure = Figure(figsize=(8, 5), dpi=100)
+        self.figure = Figure(figsize=(8, 5), dpi=100, layout='tight')
         self.ax = self.figure.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.figure, main_frame)
+        # Renders off the Tk thread, so several open windows don't stall the main one
+        self.canvas = OffscreenCanvasTkAgg(self.figure, main_frame)
         self.canvas.get_tk_widget().grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Sliders Frame
@@ -47,7 +61,7 @@ class NewsAnalysisWindow(tk.Toplevel):
         # Before Slider
         ttk.Label(sliders_frame, text="Days Before:").grid(row=0, column=0, padx=5)
         self.before_var = tk.IntVar(value=30)
-        self.before_slider = ttk.Scale(sliders_frame, from_=1, to=90, orient=tk.HORIZONTAL, variable=self.before_var, command=self.update_plot)
+        self.before_slider = ttk.Scale(sliders_frame, from_=1, to=90, orient=tk.HORIZONTAL, variable=self.before_var, command=self.schedule_update)
         self.before_slider.grid(row=0, column=1, sticky=(tk.W, tk.E))
         self.before_label = ttk.Label(sliders_frame, textvariable=self.before_var)
         self.before_label.grid(row=0, column=2, padx=5)
@@ -55,7 +69,7 @@ class NewsAnalysisWindow(tk.Toplevel):
         # After Slider
         ttk.Label(sliders_frame, text="Days After:").grid(row=1, column=0, padx=5)
         self.after_var = tk.IntVar(value=15)
-        self.after_slider = ttk.Scale(sliders_frame, from_=1, to=90, orient=tk.HORIZONTAL, variable=self.after_var, command=self.update_plot)
+        self.after_slider = ttk.Scale(sliders_frame, from_=1, to=90, orient=tk.HORIZONTAL, variable=self.after_var, command=self.schedule_update)
         self.after_slider.grid(row=1, column=1, sticky=(tk.W, tk.E))
         self.after_label = ttk.Label(sliders_frame, textvariable=self.after_var)
         self.after_label.grid(row=1, column=2, padx=5)
@@ -63,42 +77,80 @@ class NewsAnalysisWindow(tk.Toplevel):
     def load_data_and_plot(self):
         """Fetch a wide range of data initially, then plot."""
         # Fetch 1 year of data to have enough for the sliders
-        self.historical_data = self.stock_data_provider.get_historical_data(self.symbol, period="1y")
+        try:
+            self.historical_data = self.stock_data_provider.get_historical_data(self.symbol, period="1y")
+        except DataSourceError as e:
+            messagebox.showerror("Error", e.user_message, parent=self)
+            return
         if not self.historical_data.empty:
+            # Views onto the provider's shared series; dates are sorted, so every slider move is a binary search
+            self.dates = self.historical_data.dates
+            self.prices = self.historical_data.close
+            self.load_other_headlines()
+            self.setup_plot()
             self.update_plot()
 
-    def update_plot(self, _=None):
-        """Clear and redraw the plot based on slider values."""
-        if self.historical_data is None or self.historical_data.empty:
-            return
-
-        days_before = self.before_var.get()
-        days_after = self.after_var.get()
-
-        start_date = self.news_date - timedelta(days=days_before)
-        end_date = self.news_date + timedelta(days=days_after)
-        
-        # Filter data based on the selected date range
-        mask = (self.historical_data['date'].dt.date >= start_date) & (self.historical_data['date'].dt.date <= end_date)
-        plot_data = self.historical_data.loc[mask]
-
-        if plot_data.empty:
-            return
+    def load_other_headlines(self):
+        """Place the symbol's other archived headlines on the first trading day at or after each"""
+        others = self.stock_data_provider.get_archived_news(
+            self.symbol, start=self.historical_data.first_date())
+        days = np.sort(np.array([item['publish_timestamp'] for item in others
+                                 if item.get('link') != self.news_item.get('link')],
+                                dtype='datetime64[D]'))
+        index = np.searchsorted(self.dates, days.astype('datetime64[s]'), side='left')
+        index = index[index < len(self.dates)]
+        self.headline_dates = self.dates[index]
+        self.headline_prices = self.prices[index]
 
-        self.ax.clear()
-        
+    def setup_plot(self):
+        """Create the persistent artists; slider moves only update their data."""
         # Plot price trend
-        self.ax.plot(plot_data['date'], plot_data['price'], color='#2E86AB', marker='.', markersize=4)
-        
+        self.price_line, = self.ax.plot([], [], color='#2E86AB', marker='.', markersize=4)
+        self.headline_markers, = self.ax.plot([], [], linestyle='none', marker='v', color='#F18F01',
+                                              markersize=7, label='Other Headlines')
+
         # Add a vertical line for the news date
         self.ax.axvline(x=pd.to_datetime(self.news_date), color='r', linestyle='--', label='News Event')
-        
+
         self.ax.set_title(f'Price Trend Around News Event ({self.symbol})')
         self.ax.set_xlabel('Date')
         self.ax.set_ylabel('Price')
         self.ax.grid(True, alpha=0.3)
         self.ax.legend()
         self.figure.autofmt_xdate()
-        self.figure.tight_layout()
-        
-        self.canvas.draw()
\ No newline at end of file
+
+    def schedule_update(self, _=None):
+        """Coalesce slider events into at most one redraw per frame."""
+        if self.update_pending:
+            return
+        self.update_pending = True
+        # Still coalescing if a render is in flight: the plot updates once it has finished
+        self.after(FRAME_MS, self.canvas.run_when_idle, self.update_plot)
+
+    def update_plot(self, _=None):
+        """Update the plotted window in place based on slider values."""
+        self.update_pending = False
+        if self.historical_data is None or self.historical_data.empty:
+            return
+
+        days_before = self.before_var.get()
+        days_after = self.after_var.get()
+
+        news_day = np.datetime64(self.news_date, 'D')
+        start_date = news_day - np.timedelta64(days_before, 'D')
+        # Exclusive end, so the whole last day is included
+        end_date = news_day + np.timedelta64(days_after + 1, 'D')
+
+        # Binary search for the selected range; the window shares the series' memory
+        window = self.historical_data.slice_dates(start_date, end_date)
+        if window.empty:
+            return
+
+        with span('analysis.update_plot', symbol=self.symbol, rows=len(window)):
+            self.price_line.set_data(window.dates, window.close)
+            first = np.searchsorted(self.headline_dates, window.dates[0], side='left')
+            last = np.searchsorted(self.headline_dates, window.dates[-1], side='right')
+            self.headline_markers.set_data(self.headline_dates[first:last], self.headline_prices[first:last])
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
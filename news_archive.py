@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from tracing import span
+
+DEFAULT_ARCHIVE_PATH = os.path.join(os.path.expanduser("~"), ".stocksight", "news.db")
+
+EPOCH = datetime(1970, 1, 1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    source TEXT,
+    publish_ts INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS article_symbols (
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    symbol TEXT NOT NULL,
+    publish_ts INTEGER NOT NULL,
+    PRIMARY KEY (symbol, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS article_symbols_by_time ON article_symbols (symbol, publish_ts);
+CREATE INDEX IF NOT EXISTS article_symbols_by_article ON article_symbols (article_id);
+CREATE INDEX IF NOT EXISTS articles_by_time ON articles (publish_ts);
+"""
+
+# Full-text index over titles, kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, content='articles', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+"""
+
+ARTICLE_COLUMNS = "a.url, a.title, a.source, a.publish_ts"
+
+# First symbol an article was linked to, for search results
+FIRST_SYMBOL = "(SELECT MIN(symbol) FROM article_symbols WHERE article_id = a.id)"
+
+
+def to_epoch(moment):
+    return int((moment - EPOCH).total_seconds())
+
+
+def from_epoch(seconds):
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def fts_query(text):
+    """Quote each word so user input can't break FTS syntax; the last word matches as a prefix"""
+    words = [w.replace('"', '""') for w in text.split()]
+    if not words:
+        return None
+    return " ".join(f'"{w}"' for w in words[:-1]) + (" " if len(words) > 1 else "") + f'"{words[-1]}"*'
+
+
+class NewsArchive:
+    """
+    Every headline ever fetched, in SQLite. Articles are keyed by URL and linked to
+    the symbols they were found for; titles have an FTS5 index when SQLite has it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("STOCKSIGHT_NEWS_DB", DEFAULT_ARCHIVE_PATH)
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # One connection shared by every thread, serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search falls back to LIKE
+                self.has_fts = False
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def known_urls(self, urls):
+        """The subset of `urls` already archived, so callers can skip parsing them"""
+        urls = [u for u in urls if u]
+        if not urls:
+            return set()
+        known = set()
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT url FROM articles WHERE url IN ({','.join('?' * len(chunk))})", chunk)
+                known.update(row[0] for row in rows)
+        return known
+
+    def merge(self, symbol, articles, known_urls=()):
+        """
+        Add newly parsed articles (the app's news format) for a symbol, and link any
+        already-archived URLs to it as well. Returns the number of new articles.
+        """
+        symbol = symbol.upper()
+        with span('news_archive.merge', symbol=symbol, articles=len(articles)), self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO articles (url, title, source, publish_ts) VALUES (?, ?, ?, ?)",
+                [(a['link'], a['title'], a['source'], to_epoch(a['publish_timestamp'])) for a in articles])
+            added = self._conn.total_changes - before
+            urls = [a['link'] for a in articles] + list(known_urls)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO article_symbols (article_id, symbol, publish_ts) "
+                "SELECT id, ?, publish_ts FROM articles WHERE url = ?",
+                [(symbol, url) for url in urls])
+        return added
+
+    def _rows_to_articles(self, rows, symbol=None):
+        return [{
+            'title': title,
+            'time': from_epoch(ts).strftime("%Y-%m-%d %H:%M"),
+            'source': source,
+            'link': url,
+            'publish_timestamp': from_epoch(ts),
+            'symbol': row_symbol or symbol,
+        } for url, title, source, ts, row_symbol in rows]
+
+    def for_symbol(self, symbol, start=None, end=None, limit=None):
+        """Archived articles for a symbol, newest first, optionally within [start, end]"""
+        symbol = symbol.upper()
+        query = (f"SELECT {ARTICLE_COLUMNS}, s.symbol FROM article_symbols s "
+                 "JOIN articles a ON a.id = s.article_id WHERE s.symbol = ?")
+        params = [symbol]
+        if start is not None:
+            query += " AND s.publish_ts >= ?"
+            params.append(to_epoch(start))
+        if end is not None:
+            query += " AND s.publish_ts <= ?"
+            params.append(to_epoch(end))
+        query += " ORDER BY s.publish_ts DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with span('news_archive.query', symbol=symbol), self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return self._rows_to_articles(rows, symbol)
+
+    def search(self, text, symbol=None, limit=200):
+        """Keyword search over archived titles, newest first"""
+        if self.has_fts:
+            match = fts_query(text)
+            if match is None:
+                return []
+            inner = ("SELECT a.* FROM articles_fts f JOIN articles a ON a.id = f.rowid "
+                     "WHERE articles_fts MATCH ?")
+            params = [match]
+        else:
+            inner = "SELECT a.* FROM articles a WHERE a.title LIKE ?"
+            params = [f"%{text.strip()}%"]
+        if symbol:
+            inner += " AND a.id IN (SELECT article_id FROM article_symbols WHERE symbol = ?)"
+            params.append(symbol.upper())
+        inner += " ORDER BY a.publish_ts DESC LIMIT ?"
+        params.append(limit)
+        # Look up symbols only for the rows that survive the LIMIT
+        query = f"SELECT {ARTICLE_COLUMNS}, {FIRST_SYMBOL} FROM ({inner}) a ORDER BY a.publish_ts DESC"
+        with span('news_archive.search', text=text), self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return self._rows_to_articles(rows)
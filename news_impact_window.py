@@ -0,0 +1,138 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from event_study import run_event_study, benchmark_for
+from transport import DataSourceError
+
+class NewsImpactWindow(tk.Toplevel):
+    """Event study over every headline for a symbol: a per-article table plus the average impact curve."""
+
+    def __init__(self, parent, symbol, stock_data_provider):
+        super().__init__(parent)
+        self.symbol = symbol
+        self.stock_data_provider = stock_data_provider
+
+        self.title(f"News Impact (all headlines) for {self.symbol}")
+        self.geometry("900x700")
+
+        self.news_items = []
+        self.historical_data = None
+        self.benchmark_data = None
+
+        self.setup_ui()
+        self.load_data()
+        self.run_study()
+
+    def setup_ui(self):
+        """Setup the controls, results table and average-impact chart."""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+
+        controls = ttk.Frame(main_frame)
+        controls.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+
+        ttk.Label(controls, text="Days Before:").pack(side=tk.LEFT, padx=(0, 5))
+        self.before_var = tk.IntVar(value=5)
+        ttk.Spinbox(controls, from_=1, to=30, width=4, textvariable=self.before_var).pack(side=tk.LEFT, padx=(0, 10))
+
+        ttk.Label(controls, text="Days After:").pack(side=tk.LEFT, padx=(0, 5))
+        self.after_var = tk.IntVar(value=10)
+        ttk.Spinbox(controls, from_=1, to=30, width=4, textvariable=self.after_var).pack(side=tk.LEFT, padx=(0, 10))
+
+        self.benchmark_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(controls, text=f"Market model vs {benchmark_for(self.symbol)}",
+                        variable=self.benchmark_var).pack(side=tk.LEFT, padx=(0, 10))
+
+        ttk.Button(controls, text="Run", command=self.run_study).pack(side=tk.LEFT)
+
+        # Results table
+        table_frame = ttk.Frame(main_frame)
+        table_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        columns = ('date', 'pre_return', 'post_return', 'pre_car', 'post_car')
+        self.tree = ttk.Treeview(table_frame, columns=columns)
+        self.tree.heading('#0', text='Headline')
+        self.tree.column('#0', width=380)
+        for column, heading in zip(columns, ('Date', 'Return Before %', 'Return After %', 'CAR Before %', 'CAR After %')):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=90, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(table_frame, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Average cumulative abnormal return chart
+        self.figure = Figure(figsize=(8, 3), dpi=100)
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, main_frame)
+        self.canvas.get_tk_widget().grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(10, 0))
+
+    def load_data(self):
+        """Fetch the headlines, the price history and the benchmark index once."""
+        # Refresh the archive first, then study every archived headline in the price window
+        try:
+            self.stock_data_provider.get_stock_news(self.symbol)
+        except DataSourceError as e:
+            # Study whatever is already archived
+            print(f"Could not refresh news for {self.symbol}: {e}")
+        try:
+            self.historical_data = self.stock_data_provider.get_historical_data(self.symbol, period="1y")
+            self.benchmark_data = self.stock_data_provider.get_historical_data(benchmark_for(self.symbol), period="1y")
+        except DataSourceError as e:
+            messagebox.showerror("Error", e.user_message, parent=self)
+            if self.historical_data is None:
+                return
+        start = self.historical_data.first_date()
+        self.news_items = self.stock_data_provider.get_archived_news(self.symbol, start=start)
+
+    def run_study(self):
+        """Compute abnormal returns for every headline and show the results."""
+        if self.historical_data is None or self.historical_data.empty or not self.news_items:
+            messagebox.showinfo("Info", f"Not enough price or news data for {self.symbol}.", parent=self)
+            return
+
+        benchmark = {}
+        if self.benchmark_var.get() and self.benchmark_data is not None and not self.benchmark_data.empty:
+            benchmark = dict(benchmark_dates=self.benchmark_data.dates,
+                             benchmark_prices=self.benchmark_data.close)
+
+        events, curve = run_event_study(
+            self.historical_data.dates,
+            self.historical_data.close,
+            [item['publish_timestamp'] for item in self.news_items],
+            before=self.before_var.get(), after=self.after_var.get(), **benchmark)
+
+        self.tree.delete(*self.tree.get_children())
+        for index, row in events.iterrows():
+            self.tree.insert('', tk.END, text=self.news_items[index]['title'], values=(
+                str(row['date'])[:10],
+                percent(row['pre_return']),
+                percent(row['post_return']),
+                percent(row['pre_car']),
+                percent(row['post_car']),
+            ))
+
+        self.ax.clear()
+        self.ax.plot(curve['offset'], curve['mean_car'], color='#2E86AB', marker='.', label='Average CAR')
+        self.ax.fill_between(curve['offset'], curve['mean_car'] - 2 * curve['stderr'],
+                             curve['mean_car'] + 2 * curve['stderr'], color='#2E86AB', alpha=0.15)
+        self.ax.axvline(x=0, color='r', linestyle='--', label='News Event')
+        self.ax.axhline(y=0, color='gray', linewidth=0.8)
+        # Headlines whose whole window has data; recent ones have no full post-event window yet
+        used = int(curve['events'].iloc[-1]) if len(curve) else 0
+        self.ax.set_title(f'Average Cumulative Abnormal Return ({used} of {len(events)} headlines)')
+        self.ax.set_xlabel('Trading days from news')
+        self.ax.set_ylabel('CAR %')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.legend()
+        self.figure.tight_layout()
+        self.canvas.draw()
+
+
+def percent(value):
+    """Signed percentage for the table, or n/a for a window missing data"""
+    return "n/a" if pd.isna(value) else f"{value:+.2f}"
@@ -0,0 +1,130 @@
+from collections import deque
+
+# How headlines actually name each company; the first alias is also used as the
+# Google News search term. Matching is case-insensitive on whole words, so every
+# alias must be unambiguous on its own ('Titan Company', not 'Titan').
+SYMBOL_ALIASES = {
+    'RELIANCE.NS': ['Reliance Industries', 'RIL', 'Reliance Jio', 'Reliance Retail'],
+    'TCS.NS': ['Tata Consultancy Services', 'TCS'],
+    'HDFCBANK.NS': ['HDFC Bank'],
+    'INFY.NS': ['Infosys'],
+    'ICICIBANK.NS': ['ICICI Bank'],
+    'SBIN.NS': ['State Bank of India', 'SBI'],
+    'BHARTIARTL.NS': ['Bharti Airtel', 'Airtel'],
+    'ITC.NS': ['ITC'],
+    'KOTAKBANK.NS': ['Kotak Mahindra Bank', 'Kotak Bank'],
+    'LT.NS': ['Larsen & Toubro', 'Larsen and Toubro', 'L&T'],
+    'AXISBANK.NS': ['Axis Bank'],
+    'HINDUNILVR.NS': ['Hindustan Unilever', 'HUL'],
+    'BAJFINANCE.NS': ['Bajaj Finance'],
+    'MARUTI.NS': ['Maruti Suzuki', 'Maruti'],
+    'ASIANPAINT.NS': ['Asian Paints'],
+    'SUNPHARMA.NS': ['Sun Pharmaceutical', 'Sun Pharma'],
+    'TATAMOTORS.NS': ['Tata Motors'],
+    'TATASTEEL.NS': ['Tata Steel'],
+    'WIPRO.NS': ['Wipro'],
+    'HCLTECH.NS': ['HCL Technologies', 'HCLTech', 'HCL Tech'],
+    'TECHM.NS': ['Tech Mahindra'],
+    'M&M.NS': ['Mahindra & Mahindra', 'Mahindra and Mahindra', 'M&M'],
+    'ULTRACEMCO.NS': ['UltraTech Cement', 'UltraTech'],
+    'NTPC.NS': ['NTPC'],
+    'POWERGRID.NS': ['Power Grid Corporation', 'Power Grid Corp', 'POWERGRID'],
+    'ONGC.NS': ['Oil and Natural Gas Corporation', 'ONGC'],
+    'COALINDIA.NS': ['Coal India'],
+    'ADANIENT.NS': ['Adani Enterprises'],
+    'ADANIPORTS.NS': ['Adani Ports'],
+    'TITAN.NS': ['Titan Company', 'Titan Co'],
+    'NESTLEIND.NS': ['Nestle India'],
+    'JSWSTEEL.NS': ['JSW Steel'],
+    'ZOMATO.NS': ['Zomato'],
+    'AAPL': ['Apple Inc', 'iPhone maker'],
+    'MSFT': ['Microsoft'],
+    'GOOGL': ['Alphabet', 'Google'],
+    'AMZN': ['Amazon.com', 'Amazon Web Services'],
+    'META': ['Meta Platforms', 'Facebook'],
+    'NVDA': ['Nvidia'],
+    'TSLA': ['Tesla'],
+}
+
+
+def aliases_for(symbol):
+    """Known company names for a symbol, falling back to the bare ticker"""
+    symbol = symbol.upper()
+    return SYMBOL_ALIASES.get(symbol) or [symbol.split('.')[0]]
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: after building, one pass over a text finds every
+    occurrence of every pattern, however many patterns there are.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+
+    def add(self, pattern, value):
+        node = 0
+        for char in pattern:
+            if char not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[node][char] = len(self.goto) - 1
+            node = self.goto[node][char]
+        self.outputs[node].append((len(pattern), value))
+
+    def build(self):
+        """Compute failure links breadth-first; call once after adding every pattern"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+        return self
+
+    def find(self, text):
+        """Yield (start, end, value) for every pattern occurrence in text"""
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for length, value in self.outputs[node]:
+                yield i - length + 1, i + 1, value
+
+
+class HeadlineTagger:
+    """Tags headlines with every symbol whose company name they mention, in one pass per headline."""
+
+    def __init__(self, symbols=None):
+        self.symbols = sorted({s.upper() for s in (symbols or SYMBOL_ALIASES)})
+        # Company names match in any case. A symbol with no known names only matches its
+        # ticker written in capitals, so IDEA or BEL are not found in ordinary words.
+        self.names = AhoCorasick()
+        self.tickers = AhoCorasick()
+        for symbol in self.symbols:
+            if symbol in SYMBOL_ALIASES:
+                for alias in SYMBOL_ALIASES[symbol]:
+                    self.names.add(alias.lower(), symbol)
+            else:
+                self.tickers.add(symbol.split('.')[0], symbol)
+        self.names.build()
+        self.tickers.build()
+
+    def tag(self, title):
+        """Symbols mentioned in a headline, matching whole words only"""
+        found = set()
+        for text, matcher in ((title.lower(), self.names), (title, self.tickers)):
+            for start, end, symbol in matcher.find(text):
+                before = text[start - 1] if start else ' '
+                after = text[end] if end < len(text) else ' '
+                if not before.isalnum() and not after.isalnum():
+                    found.add(symbol)
+        return found
@@ -1,89 +1,261 @@
+import textwrap
 import tkinter as tk
 from tkinter import ttk
-import webbrowser
+import tkinter.font as tkfont
+from tracing import span
+
+# Every headline gets the same height, so the visible rows follow from the scroll offset
+ROW_HEIGHT = 56
+ROW_PADDING = 10
+TITLE_FONT = ('Arial', 10, 'bold')
+META_FONT = ('Arial', 8)
+
+# Oldest headlines are dropped beyond this many
+MAX_ITEMS = 5000
 
 class NewsWidget:
-    def __init__(self, parent, news_click_callback):
+    def __init__(self, parent, news_click_callback, search_callback=None):
         self.parent = parent
         self.frame = ttk.Frame(parent)
         self.news_click_callback = news_click_callback
+        # search_callback(text) -> matching headlines from the archive
+        self.search_callback = search_callback
+        self.search_results = None
+
+        # Every headline seen so far, newest first, plus the same items per symbol.
+        # One article can be news for several symbols, so it is known per (symbol, link)
         self.news_items = []
+        self.by_symbol = {}
+        self.known_links = set()
+        self.current_symbol = None
+
+        # Canvas items reused for whichever rows are on screen
+        self.rows = []
+        self.chars_per_line = 40
 
         self.setup_news_display()
-        
+
     def setup_news_display(self):
         """Setup the news display area"""
+        header = ttk.Frame(self.frame)
+        header.pack(fill=tk.X, pady=(0, 10))
+
         # Title
-        title_label = ttk.Label(self.frame, text="Latest News", 
-                               font=('Arial', 12, 'bold'))
-        title_label.pack(pady=(0, 10), anchor='w')
-        
-        # Create scrollable text widget for news
+        self.title_label = ttk.Label(header, text="Latest News",
+                                     font=('Arial', 12, 'bold'))
+        self.title_label.pack(side=tk.LEFT, anchor='w')
+
+        self.current_only_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(header, text="Current symbol only", variable=self.current_only_var,
+                        command=self.on_filter_changed).pack(side=tk.RIGHT)
+
+        if self.search_callback:
+            search_row = ttk.Frame(self.frame)
+            search_row.pack(fill=tk.X, pady=(0, 5))
+            self.search_var = tk.StringVar()
+            search_entry = ttk.Entry(search_row, textvariable=self.search_var)
+            search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+            search_entry.bind('<Return>', self.on_search)
+            ttk.Button(search_row, text="Search", command=self.on_search).pack(side=tk.LEFT, padx=(5, 0))
+            ttk.Button(search_row, text="Clear", command=self.clear_search).pack(side=tk.LEFT, padx=(5, 0))
+
+        # Scrollable canvas that only ever draws the rows in view
         news_frame = ttk.Frame(self.frame)
         news_frame.pack(fill=tk.BOTH, expand=True)
-        
+
         # Scrollbar
-        scrollbar = ttk.Scrollbar(news_frame)
+        scrollbar = ttk.Scrollbar(news_frame, command=self.on_scroll)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Text widget for news
-        self.news_text = tk.Text(news_frame, 
-                                wrap=tk.WORD, 
+
+        self.canvas = tk.Canvas(news_frame,
                                 yscrollcommand=scrollbar.set,
-                                font=('Arial', 9),
                                 bg='white',
-                                relief='flat',
-                                padx=10,
-                                pady=10)
-        self.news_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        scrollbar.config(command=self.news_text.yview)
-        
-        self.news_text.tag_configure('title', font=('Arial', 10, 'bold'), foreground='#0000EE', underline=True)
-        self.news_text.tag_configure('time', font=('Arial', 8), foreground='gray')
-        
-        self.show_placeholder()
-        
+                                highlightthickness=0,
+                                yscrollincrement=ROW_HEIGHT // 4)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # One set of handlers for the whole list; rows are resolved from the y position
+        self.canvas.bind('<Configure>', self.on_resize)
+        self.canvas.bind('<Button-1>', self.on_click)
+        self.canvas.bind('<Motion>', self.on_motion)
+        self.canvas.bind('<MouseWheel>', self.on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda e: self.on_scroll('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.on_scroll('scroll', 1, 'units'))
+
+        self.title_font = tkfont.Font(font=TITLE_FONT)
+        self.placeholder = self.canvas.create_text(ROW_PADDING, ROW_PADDING, anchor='nw', font=('Arial', 9),
+                                                   text="Search for a stock to view related news...")
+
     def show_placeholder(self):
         """Show placeholder text"""
-        self.news_text.config(state=tk.NORMAL)
-        self.news_text.delete(1.0, tk.END)
-        self.news_text.insert(tk.END, "Search for a stock to view related news...")
-        self.news_text.config(state=tk.DISABLED)
-        
+        text = (f"No recent news for {self.current_symbol}." if self.current_symbol
+                else "Search for a stock to view related news...")
+        self.canvas.itemconfigure(self.placeholder, text=text, state=tk.NORMAL)
+        for row in self.rows:
+            for item in row:
+                self.canvas.itemconfigure(item, state=tk.HIDDEN)
+
     def update_news(self, news_data, symbol):
-        """Update news display with new data and make it clickable"""
-        self.news_text.config(state=tk.NORMAL)
-        self.news_text.delete(1.0, tk.END)
-        self.news_items = news_data # Store news data
-        
-        if not self.news_items:
+        """Merge new headlines for a symbol into the list"""
+        with span('news_widget.update', symbol=symbol, articles=len(news_data)):
+            self.merge_news(news_data, symbol)
+
+    def merge_news(self, news_data, symbol):
+        """Prepend only articles not yet seen for their symbol, then redraw the visible rows"""
+        symbol_changed = symbol != self.current_symbol
+        self.current_symbol = symbol
+        if self.search_results is None:
+            self.title_label.config(text=f"News for {symbol}")
+
+        fresh = []
+        for news in news_data:
+            key = (news.get('symbol', symbol), news.get('link'))
+            if key in self.known_links:
+                continue
+            self.known_links.add(key)
+            fresh.append(dict(news, symbol=key[0]))
+
+        first_row = self.first_visible_row()
+        self.news_items[:0] = fresh
+        for news in reversed(fresh):
+            self.by_symbol.setdefault(news['symbol'], []).insert(0, news)
+        self.trim()
+
+        if self.search_results is not None:
+            pass  # The search results on screen are unchanged
+        elif symbol_changed:
+            self.canvas.yview_moveto(0)
+        elif first_row and fresh:
+            # Keep the rows the user is reading where they are
+            if self.current_only_var.get():
+                added = sum(1 for news in fresh if news['symbol'] == symbol)
+            else:
+                added = len(fresh)
+            self.scroll_to_row(first_row + added)
+        self.redraw()
+
+    def trim(self):
+        """Drop the oldest headlines beyond MAX_ITEMS"""
+        while len(self.news_items) > MAX_ITEMS:
+            news = self.news_items.pop()
+            self.known_links.discard((news['symbol'], news.get('link')))
+            symbol_items = self.by_symbol.get(news['symbol'])
+            if symbol_items:
+                symbol_items.pop()
+
+    def items_for(self, symbol):
+        """Headlines for one symbol, newest first"""
+        return self.by_symbol.get(symbol, [])
+
+    def visible_items(self):
+        if self.search_results is not None:
+            return self.search_results
+        if self.current_only_var.get():
+            return self.items_for(self.current_symbol)
+        return self.news_items
+
+    def on_search(self, event=None):
+        """Show archive matches for the search box text in place of the feed"""
+        text = self.search_var.get().strip()
+        if not text:
+            self.clear_search()
+            return
+        with span('news_widget.search', text=text):
+            self.search_results = self.search_callback(text)
+        self.title_label.config(text=f"Search: {text} ({len(self.search_results)})")
+        self.canvas.yview_moveto(0)
+        self.redraw()
+
+    def clear_search(self):
+        self.search_var.set("")
+        self.search_results = None
+        self.title_label.config(text=f"News for {self.current_symbol}" if self.current_symbol else "Latest News")
+        self.canvas.yview_moveto(0)
+        self.redraw()
+
+    def on_filter_changed(self):
+        self.canvas.yview_moveto(0)
+        self.redraw()
+
+    def on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def on_mousewheel(self, event):
+        # Windows reports 120 per notch; macOS reports small deltas, each worth one unit
+        if abs(event.delta) >= 120:
+            self.on_scroll('scroll', -int(event.delta / 120), 'units')
+        elif event.delta:
+            self.on_scroll('scroll', -1 if event.delta > 0 else 1, 'units')
+
+    def on_resize(self, event):
+        # Titles wrap to two lines at most, so estimate how many characters fit per line
+        self.chars_per_line = max(10, (event.width - 2 * ROW_PADDING) // max(self.title_font.measure('n'), 1))
+        self.redraw()
+
+    def first_visible_row(self):
+        return int(self.canvas.canvasy(0)) // ROW_HEIGHT
+
+    def scroll_to_row(self, row):
+        total = max(len(self.visible_items()) * ROW_HEIGHT, 1)
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), total))
+        self.canvas.yview_moveto(row * ROW_HEIGHT / total)
+
+    def ensure_rows(self, count):
+        """Grow the pool of reusable row items to `count`"""
+        while len(self.rows) < count:
+            title = self.canvas.create_text(0, 0, anchor='nw', font=TITLE_FONT, fill='#0000EE', state=tk.HIDDEN)
+            meta = self.canvas.create_text(0, 0, anchor='nw', font=META_FONT, fill='gray', state=tk.HIDDEN)
+            self.rows.append((title, meta))
+
+    def redraw(self, event=None):
+        """Point the pooled row items at whichever headlines are in view"""
+        items = self.visible_items()
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        self.canvas.configure(scrollregion=(0, 0, width, max(len(items) * ROW_HEIGHT, height)))
+        if not items:
             self.show_placeholder()
             return
-            
-        self.news_text.insert(tk.END, f"News for {symbol}\n\n")
-        
-        for i, news in enumerate(self.news_items):
-            tag_name = f"news_{i}"
-            
-            # Insert title with a unique tag
-            self.news_text.insert(tk.END, f"• {news['title']}\n", ('title', tag_name))
-            
-            # Bind click event to the tag
-            self.news_text.tag_bind(tag_name, "<Button-1>", lambda e, index=i: self.on_news_click(index))
-            self.news_text.tag_bind(tag_name, "<Enter>", lambda e: self.news_text.config(cursor="hand2"))
-            self.news_text.tag_bind(tag_name, "<Leave>", lambda e: self.news_text.config(cursor=""))
-            
-            self.news_text.insert(tk.END, f"  {news['time']} - {news['source']}\n\n", 'time')
-            
-        self.news_text.config(state=tk.DISABLED)
-
-    def on_news_click(self, index):
+        self.canvas.itemconfigure(self.placeholder, state=tk.HIDDEN)
+
+        first = self.first_visible_row()
+        count = height // ROW_HEIGHT + 2
+        self.ensure_rows(count)
+        for offset, (title, meta) in enumerate(self.rows):
+            index = first + offset
+            if offset >= count or index >= len(items):
+                self.canvas.itemconfigure(title, state=tk.HIDDEN)
+                self.canvas.itemconfigure(meta, state=tk.HIDDEN)
+                continue
+            news = items[index]
+            y = index * ROW_HEIGHT + ROW_PADDING // 2
+            text = textwrap.shorten(f"• {news['title']}", width=2 * self.chars_per_line, placeholder='…')
+            self.canvas.coords(title, ROW_PADDING, y)
+            self.canvas.itemconfigure(title, text=text, width=width - 2 * ROW_PADDING, state=tk.NORMAL)
+            self.canvas.coords(meta, ROW_PADDING + 10, y + ROW_HEIGHT - 20)
+            self.canvas.itemconfigure(meta, text=f"{news['time']} - {news['source']} · {news['symbol']}",
+                                      state=tk.NORMAL)
+
+    def row_at(self, event):
+        """The headline under the pointer, or None"""
+        items = self.visible_items()
+        index = int(self.canvas.canvasy(event.y)) // ROW_HEIGHT
+        return items[index] if 0 <= index < len(items) else None
+
+    def on_motion(self, event):
+        self.canvas.config(cursor="hand2" if self.row_at(event) is not None else "")
+
+    def on_news_click(self, news):
         """Handle news item click"""
         if self.news_click_callback:
-            clicked_news_item = self.news_items[index]
-            self.news_click_callback(clicked_news_item)
-        
+            self.news_click_callback(news)
+
+    def on_click(self, event):
+        news = self.row_at(event)
+        if news is not None:
+            self.on_news_click(news)
+
     def get_frame(self):
         """Return the frame widget"""
-        return self.frame
\ No newline at end of file
+        return self.frame
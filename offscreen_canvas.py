@@ -0,0 +1,138 @@
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from tracing import span
+
+# Shared by every offscreen canvas; each canvas has at most one render in flight,
+# so two charts (say the main chart and an analysis window) can render at once
+_render_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="render")
+
+
+class OffscreenCanvasTkAgg(FigureCanvasTkAgg):
+    """
+    FigureCanvasTkAgg whose full draws run on a worker thread: the figure is laid out
+    and rendered into the Agg buffer off the Tk thread, which only blits the finished
+    image. While a render is in flight the figure belongs to the worker, so callers
+    change it through run_when_idle, and resizes and mouse/key input (toolbar pan and
+    zoom, keyboard shortcuts) wait until the render is done.
+    A render overtaken by a resize is dropped rather than shown at the old size.
+    """
+
+    def __init__(self, figure, master=None):
+        super().__init__(figure, master)
+        self.rendering = False
+        self._generation = 0
+        self._redraw = False
+        self._pending_resize = None
+        self._idle_callbacks = []
+
+    def draw(self):
+        """Start rendering the figure at its current size; a draw during a render runs after it"""
+        if self.rendering:
+            self._redraw = True
+            return
+        self.rendering = True
+        self._generation += 1
+        _render_pool.submit(self._render, self._generation)
+
+    def _render(self, generation):
+        error = None
+        try:
+            with span('canvas.render', generation=generation):
+                # FigureCanvasAgg.draw, minus the toolbar's wait cursor: that is Tk state,
+                # and the Tk thread stays responsive during the render anyway
+                self.renderer = self.get_renderer()
+                self.renderer.clear()
+                self.figure.draw(self.renderer)
+        except Exception as e:
+            error = e
+        try:
+            self.get_tk_widget().after(0, self._finish, generation, error)
+        except (tk.TclError, RuntimeError):
+            pass  # The window was closed while rendering
+
+    def _finish(self, generation, error):
+        self.rendering = False
+        if error is not None:
+            print(f"Error rendering chart: {error}")
+        elif generation == self._generation:
+            self.blit()
+
+        if self._pending_resize is not None:
+            event, self._pending_resize = self._pending_resize, None
+            super().resize(event)
+        # Queued changes run in order; one that starts a new render leaves the rest queued
+        while self._idle_callbacks and not self.rendering:
+            fn, args = self._idle_callbacks.pop(0)
+            fn(*args)
+        if self._redraw and not self.rendering:
+            self._redraw = False
+            self.draw()
+
+    def run_when_idle(self, fn, *args, latest_only=False):
+        """
+        Run fn(*args) on the Tk thread now, or as soon as the render in flight finishes.
+        With latest_only, a call still queued for the same fn is replaced by this one.
+        """
+        if not self.rendering:
+            fn(*args)
+            return
+        if latest_only:
+            self._idle_callbacks = [(f, a) for f, a in self._idle_callbacks if f != fn]
+        self._idle_callbacks.append((fn, args))
+
+    def resize(self, event):
+        if self.rendering:
+            # Drop the in-flight image, which has the old size, and resize once the worker is done
+            self._generation += 1
+            self._pending_resize = event
+            return
+        super().resize(event)
+
+    # Input handlers can change the view, so during a render they are replayed after
+    # it, in order; only the latest pointer motion is kept
+    def motion_notify_event(self, event):
+        self.run_when_idle(super().motion_notify_event, event, latest_only=True)
+
+    def button_press_event(self, event, dblclick=False):
+        self.run_when_idle(super().button_press_event, event, dblclick)
+
+    def button_release_event(self, event):
+        self.run_when_idle(super().button_release_event, event)
+
+    def scroll_event(self, event):
+        self.run_when_idle(super().scroll_event, event)
+
+    def scroll_event_windows(self, event):
+        self.run_when_idle(super().scroll_event_windows, event)
+
+    def key_press(self, event):
+        self.run_when_idle(super().key_press, event)
+
+    def key_release(self, event):
+        self.run_when_idle(super().key_release, event)
+
+
+class OffscreenNavigationToolbar(NavigationToolbar2Tk):
+    """NavigationToolbar2Tk for an OffscreenCanvasTkAgg: its buttons wait for the render in flight"""
+
+    def home(self, *args):
+        self.canvas.run_when_idle(super().home, *args)
+
+    def back(self, *args):
+        self.canvas.run_when_idle(super().back, *args)
+
+    def forward(self, *args):
+        self.canvas.run_when_idle(super().forward, *args)
+
+    def pan(self, *args):
+        self.canvas.run_when_idle(super().pan, *args)
+
+    def zoom(self, *args):
+        self.canvas.run_when_idle(super().zoom, *args)
+
+    def configure_subplots(self, *args):
+        self.canvas.run_when_idle(super().configure_subplots, *args)
+
+    def save_figure(self, *args):
+        self.canvas.run_when_idle(super().save_figure, *args)
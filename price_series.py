@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _readonly(array):
+    array.flags.writeable = False
+    return array
+
+
+class PriceSeries:
+    """
+    One symbol's daily bars as plain columns: int64 epoch seconds, float32 open/high/low
+    and float64 close/volume. Arrays are read-only, so the provider's cached copy is
+    shared by every widget and slicing never copies. `stale` holds the error that kept
+    stored bars from being brought up to date, or None.
+    """
+
+    __slots__ = ('symbol', 'timestamps', 'open', 'high', 'low', 'close', 'volume', 'stale')
+    _ARRAYS = __slots__[1:7]
+
+    def __init__(self, symbol, timestamps, open, high, low, close, volume, stale=None):
+        self.symbol = symbol
+        self.stale = stale
+        self.timestamps = _readonly(np.asarray(timestamps, dtype=np.int64))
+        self.open = _readonly(np.asarray(open, dtype=np.float32))
+        self.high = _readonly(np.asarray(high, dtype=np.float32))
+        self.low = _readonly(np.asarray(low, dtype=np.float32))
+        self.close = _readonly(np.asarray(close, dtype=np.float64))
+        self.volume = _readonly(np.asarray(volume, dtype=np.float64))
+
+    @classmethod
+    def from_frame(cls, symbol, frame):
+        """Build from an OHLCV frame with a 'date' column (the PriceStore format)"""
+        if frame.empty:
+            return cls(symbol, *([] for _ in range(6)))
+        dates = pd.to_datetime(frame['date'])
+        if dates.dt.tz is not None:
+            dates = dates.dt.tz_localize(None)
+        timestamps = dates.to_numpy().astype('datetime64[s]').astype(np.int64)
+        return cls(symbol, timestamps, *(frame[field].to_numpy() for field in OHLCV_FIELDS),
+                   stale=frame.attrs.get('stale'))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def empty(self):
+        return len(self.timestamps) == 0
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self._ARRAYS)
+
+    @property
+    def dates(self):
+        """The timestamps as a datetime64[s] view"""
+        return self.timestamps.view('datetime64[s]')
+
+    def __getitem__(self, index):
+        """Slice by position; the result shares this series' memory"""
+        if not isinstance(index, slice):
+            raise TypeError("PriceSeries only supports slicing; use bar(i) for one bar")
+        return PriceSeries(self.symbol, *(getattr(self, name)[index] for name in self._ARRAYS),
+                           stale=self.stale)
+
+    def slice_dates(self, start=None, end=None):
+        """Bars with start <= date < end, as a zero-copy view"""
+        first = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 's'), side='left'))
+        last = len(self) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 's'), side='left'))
+        return self[first:last]
+
+    def first_date(self):
+        """The first bar's time as a datetime, or None while empty"""
+        return self.dates[0].item() if len(self) else None
+
+    def bar(self, i):
+        """One bar as a dict, in the shape the indicator engine reads"""
+        bar = {field: float(getattr(self, name)[i])
+               for field, name in zip(OHLCV_FIELDS, self._ARRAYS[1:])}
+        bar['date'] = pd.Timestamp(int(self.timestamps[i]), unit='s')
+        return bar
+
+    def to_frame(self):
+        """Copy as a DataFrame with a 'date' column and yfinance column names"""
+        frame = pd.DataFrame({field: getattr(self, name).astype(np.float64)
+                              for field, name in zip(OHLCV_FIELDS, self._ARRAYS[1:])})
+        frame.insert(0, 'date', pd.to_datetime(self.timestamps, unit='s'))
+        return frame
@@ -0,0 +1,175 @@
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+from tracing import span
+
+# Parquet needs pyarrow; fall back to pickle files when it is not installed.
+try:
+    import pyarrow  # noqa: F401
+    _USE_PARQUET = True
+except ImportError:
+    _USE_PARQUET = False
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".stocksight", "ohlcv")
+
+OHLCV_COLUMNS = ['date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+# How far back each yfinance period string reaches
+PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653,
+}
+
+
+def period_start(period, now=None):
+    """Return the first date covered by a yfinance period string (None for 'max')"""
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return today.replace(month=1, day=1)
+    if period not in PERIOD_DAYS:
+        raise ValueError(f"Unsupported period: {period}")
+    return today - timedelta(days=PERIOD_DAYS[period])
+
+
+class PriceStore:
+    """Keeps every daily OHLCV bar ever fetched, one columnar file per symbol."""
+
+    def __init__(self, store_dir=None):
+        self.store_dir = store_dir or os.environ.get("STOCKSIGHT_STORE_DIR", DEFAULT_STORE_DIR)
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, symbol):
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _data_path(self, symbol):
+        ext = "parquet" if _USE_PARQUET else "pkl"
+        return os.path.join(self.store_dir, f"{symbol.upper()}.{ext}")
+
+    def _meta_path(self, symbol):
+        return os.path.join(self.store_dir, f"{symbol.upper()}.json")
+
+    def symbols(self):
+        """List every symbol that has bars on disk"""
+        ext = ".parquet" if _USE_PARQUET else ".pkl"
+        return sorted(name[:-len(ext)] for name in os.listdir(self.store_dir) if name.endswith(ext))
+
+    def load(self, symbol):
+        """Load the stored bars and metadata for a symbol (empty frame if none)"""
+        path = self._data_path(symbol)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=OHLCV_COLUMNS), {}
+        try:
+            data = pd.read_parquet(path) if _USE_PARQUET else pd.read_pickle(path)
+            with open(self._meta_path(symbol)) as f:
+                meta = json.load(f)
+            return data, meta
+        except Exception as e:
+            # A corrupt file is treated as a cache miss and rewritten on the next fetch
+            print(f"Error reading price store for {symbol}: {e}")
+            return pd.DataFrame(columns=OHLCV_COLUMNS), {}
+
+    def bars(self, symbol):
+        """Just the stored bars for a symbol, without metadata or a network top-up"""
+        path = self._data_path(symbol)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        try:
+            return pd.read_parquet(path) if _USE_PARQUET else pd.read_pickle(path)
+        except Exception as e:
+            print(f"Error reading price store for {symbol}: {e}")
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    def last_bar_date(self, symbols=None):
+        """Latest 'YYYY-MM-DD' bar date across `symbols` (default: every stored symbol), or None"""
+        latest = None
+        for symbol in (self.symbols() if symbols is None else symbols):
+            try:
+                with open(self._meta_path(symbol)) as f:
+                    last = json.load(f).get('last_bar')
+            except (OSError, ValueError):
+                last = None
+            if last is None:
+                # Stored before the metadata recorded it
+                data = self.bars(symbol)
+                last = None if data.empty else data['date'].iloc[-1].strftime("%Y-%m-%d")
+            if last and (latest is None or last > latest):
+                latest = last
+        return latest
+
+    def save(self, symbol, data, meta):
+        """Atomically write bars and metadata for a symbol"""
+        path = self._data_path(symbol)
+        if not data.empty:
+            meta = {**meta, 'last_bar': data['date'].iloc[-1].strftime("%Y-%m-%d")}
+        tmp_path = path + ".tmp"
+        if _USE_PARQUET:
+            data.to_parquet(tmp_path, index=False)
+        else:
+            data.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+        meta_tmp = self._meta_path(symbol) + ".tmp"
+        with open(meta_tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_tmp, self._meta_path(symbol))
+
+    def get(self, symbol, period, fetch):
+        """
+        Return stored bars for the period, topping up from the network first.
+        `fetch(start=None, period=None)` must return a frame in OHLCV_COLUMNS layout.
+        If the top-up fails but the stored bars already cover the period, those are
+        returned with the DataSourceError in `attrs['stale']`.
+        """
+        from transport import DataSourceError
+        start = period_start(period)
+        stale = None
+        with self._lock_for(symbol):
+            with span('store.load', symbol=symbol):
+                data, meta = self.load(symbol)
+            covered_from = meta.get('covered_from')
+            covers_period = bool(covered_from) and (
+                covered_from == 'max' or (start is not None and pd.Timestamp(covered_from) <= start))
+
+            if data.empty or not covers_period:
+                # Cold start (or a longer period than we have): one full download
+                new_bars = fetch(period=period)
+                covered_from = 'max' if start is None else start.strftime("%Y-%m-%d")
+            else:
+                # Re-fetch from the last stored bar so today's partial bar is refreshed too
+                try:
+                    new_bars = fetch(start=data['date'].iloc[-1].strftime("%Y-%m-%d"))
+                except DataSourceError as e:
+                    print(f"Serving stored bars for {symbol}, top-up failed: {e}")
+                    new_bars, stale = data.iloc[:0], e
+
+            if not new_bars.empty:
+                with span('store.save', symbol=symbol, new_rows=len(new_bars)):
+                    data = merge_bars(data, new_bars)
+                    self.save(symbol, data, {
+                        'covered_from': covered_from,
+                        'updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    })
+
+        if start is not None and not data.empty:
+            data = data[data['date'] >= start].reset_index(drop=True)
+        if stale is not None:
+            data.attrs['stale'] = stale
+        return data
+
+
+def merge_bars(old, new):
+    """Append new bars, letting re-fetched dates replace their stored versions"""
+    if old.empty:
+        merged = new
+    else:
+        merged = pd.concat([old[old['date'] < new['date'].iloc[0]], new], ignore_index=True)
+    merged = merged.drop_duplicates(subset='date', keep='last').sort_values('date')
+    return merged[OHLCV_COLUMNS].reset_index(drop=True)
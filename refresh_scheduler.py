@@ -0,0 +1,119 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+# NSE trades 09:15-15:30 IST, Monday to Friday
+IST = timezone(timedelta(hours=5, minutes=30))
+NSE_OPEN = (9, 15)
+NSE_CLOSE = (15, 30)
+
+
+def nse_market_open(now=None):
+    """Return True while the NSE cash market is in session"""
+    now = now or datetime.now(IST)
+    if now.weekday() >= 5:
+        return False
+    return NSE_OPEN <= (now.hour, now.minute) < NSE_CLOSE
+
+
+class RefreshJob:
+    def __init__(self, name, fn, open_interval, closed_interval):
+        self.name = name
+        self.fn = fn
+        self.open_interval = open_interval
+        self.closed_interval = closed_interval
+        self.enabled = False
+        self.in_flight = False
+        self.failures = 0
+        self.next_run = None
+
+
+class RefreshScheduler:
+    """
+    One long-lived thread that owns every periodic refresh.
+    A job's tick is dropped while its previous run is still in flight, failures back off
+    exponentially, and intervals stretch out while the market is closed.
+    """
+
+    def __init__(self, jitter=0.1, max_backoff=600, is_market_open=nse_market_open, max_workers=2):
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.is_market_open = is_market_open
+        self.jobs = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresh")
+        self._wakeup = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def add_job(self, name, fn, open_interval, closed_interval):
+        """Register a job; `fn()` returning False or raising counts as a failure"""
+        with self._wakeup:
+            self.jobs[name] = RefreshJob(name, fn, open_interval, closed_interval)
+
+    def set_enabled(self, name, enabled, run_now=False):
+        """Turn a job on or off; re-enabling never starts a second loop"""
+        with self._wakeup:
+            job = self.jobs[name]
+            job.enabled = enabled
+            job.failures = 0
+            if enabled:
+                job.next_run = time.monotonic() if run_now else time.monotonic() + self._interval(job)
+            self._wakeup.notify()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._wakeup:
+            self._running = False
+            self._wakeup.notify()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _interval(self, job):
+        """Market-hours-aware interval with backoff and jitter applied"""
+        base = job.open_interval if self.is_market_open() else job.closed_interval
+        if job.failures:
+            base = min(base * (2 ** job.failures), max(base, self.max_backoff))
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _loop(self):
+        with self._wakeup:
+            while self._running:
+                now = time.monotonic()
+                due_times = []
+                for job in self.jobs.values():
+                    if not job.enabled:
+                        continue
+                    if job.next_run <= now:
+                        # Drop this tick if the last run has not finished yet
+                        if not job.in_flight:
+                            job.in_flight = True
+                            self._executor.submit(self._run_job, job)
+                        job.next_run = now + self._interval(job)
+                    due_times.append(job.next_run)
+
+                timeout = min(due_times) - now if due_times else None
+                self._wakeup.wait(timeout)
+
+    def _run_job(self, job):
+        try:
+            ok = job.fn() is not False
+        except Exception as e:
+            print(f"Error in refresh job '{job.name}': {e}")
+            ok = False
+
+        with self._wakeup:
+            job.in_flight = False
+            if ok:
+                job.failures = 0
+            else:
+                job.failures += 1
+                # Push the next attempt out by the backed-off interval
+                job.next_run = time.monotonic() + self._interval(job)
+                self._wakeup.notify()
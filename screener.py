@@ -0,0 +1,323 @@
+"""
+Multi-symbol screener over the local price store. A filter such as
+
+    crossed_above(close, sma(close, 50))
+    pct_change(close) > 5 and volume > 2 * avg_volume(20)
+
+is evaluated as whole-matrix operations over (symbols x sessions) arrays, built from
+each symbol's own bars and screened on its exchange's latest session. Large universes
+are split into chunks, one per process.
+"""
+import os
+import ast
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from price_store import PriceStore
+from tracing import span
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+# Ready-made screens for the screener window
+PRESETS = {
+    'Crossed above 50-day average': 'crossed_above(close, sma(close, 50))',
+    'Crossed below 50-day average': 'crossed_below(close, sma(close, 50))',
+    'Up more than 5% on 2x volume': 'pct_change(close) > 5 and volume > 2 * avg_volume(20)',
+    'Down more than 5%': 'pct_change(close) < -5',
+    'Closed at a 1-year high': 'close >= highest(close, 240)',
+    '20-day average above 50-day': 'sma(close, 20) > sma(close, 50)',
+}
+
+# Symbols per process; universes smaller than this are screened in-process
+CHUNK_SIZE = 250
+
+RESULT_COLUMNS = ['symbol', 'date', 'close', 'change_percent', 'volume', 'volume_ratio']
+
+# Sessions in the average the volume_ratio result column compares against
+VOLUME_AVERAGE = 20
+
+# Exchange whose calendar each index follows; other indices count as US
+INDEX_CALENDARS = {'^NSEI': 'NS', '^NSEBANK': 'NS', '^BSESN': 'BO'}
+
+
+class ScreenError(ValueError):
+    """The filter expression is not valid"""
+
+
+def _window(n):
+    n = int(n)
+    if n < 1:
+        raise ScreenError("window lengths must be at least 1")
+    return n
+
+
+def shift(x, n=1):
+    """Each symbol's value n sessions earlier"""
+    n = _window(n)
+    out = np.full_like(x, np.nan)
+    out[:, n:] = x[:, :-n]
+    return out
+
+
+def sma(x, n):
+    return pd.DataFrame(x.T).rolling(_window(n)).mean().to_numpy().T
+
+
+def highest(x, n):
+    return pd.DataFrame(x.T).rolling(_window(n)).max().to_numpy().T
+
+
+def lowest(x, n):
+    return pd.DataFrame(x.T).rolling(_window(n)).min().to_numpy().T
+
+
+def pct_change(x, n=1):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (x / shift(x, n) - 1) * 100
+
+
+def crossed_above(a, b):
+    return (a > b) & (shift(a) <= shift(b))
+
+
+def crossed_below(a, b):
+    return (a < b) & (shift(a) >= shift(b))
+
+
+# Functions whose arguments after the series (all of them, for avg_volume) are windows
+SERIES_FUNCTIONS = ('crossed_above', 'crossed_below')
+
+FUNCTIONS = {
+    'sma': sma,
+    'highest': highest,
+    'lowest': lowest,
+    'shift': shift,
+    'pct_change': pct_change,
+    'crossed_above': crossed_above,
+    'crossed_below': crossed_below,
+    # Uses the volume matrix, so it only takes the window
+    'avg_volume': None,
+}
+
+BIN_OPS = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide,
+    ast.BitAnd: np.logical_and, ast.BitOr: np.logical_or,
+}
+COMPARE_OPS = {
+    ast.Gt: np.greater, ast.GtE: np.greater_equal, ast.Lt: np.less, ast.LtE: np.less_equal,
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+
+
+def parse(expression):
+    """Parse and check a filter; only fields, numbers, operators and FUNCTIONS are allowed"""
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ScreenError(f"Invalid expression: {e.msg}") from None
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id not in FIELDS and node.id not in FUNCTIONS:
+            raise ScreenError(f"Unknown name '{node.id}'. Use {', '.join(FIELDS)} or {', '.join(FUNCTIONS)}")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+            raise ScreenError("Only the screener functions can be called")
+        if isinstance(node, ast.Call) and node.keywords:
+            raise ScreenError("Keyword arguments are not supported")
+        if isinstance(node, ast.Call) and not all(isinstance(arg, ast.Constant) for arg in _windows(node)):
+            # Windows decide how much history is stacked, so they must be known up front
+            raise ScreenError(f"{node.func.id}(): window lengths must be plain numbers, e.g. sma(close, 50)")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ScreenError("Only numbers are allowed as constants")
+        if not isinstance(node, (ast.Expression, ast.Name, ast.Load, ast.Call, ast.Constant, ast.BinOp,
+                                 ast.UnaryOp, ast.USub, ast.Not, ast.Invert, ast.BoolOp, ast.And, ast.Or,
+                                 ast.Compare)) and type(node) not in BIN_OPS and type(node) not in COMPARE_OPS:
+            raise ScreenError(f"'{type(node).__name__}' is not allowed in a screen")
+    return tree
+
+
+def _windows(call):
+    if call.func.id in SERIES_FUNCTIONS:
+        return []
+    return call.args if call.func.id == 'avg_volume' else call.args[1:]
+
+
+def lookback(tree):
+    """
+    Sessions of history the expression needs on the last date. Windows add up along
+    each call path: pct_change(sma(close, 50), 10) needs 50 + 10 sessions.
+    """
+
+    def sessions(node):
+        inner = max([sessions(child) for child in ast.iter_child_nodes(node)] + [1])
+        if not isinstance(node, ast.Call):
+            return inner
+        windows = [max(0, int(arg.value)) for arg in _windows(node)]
+        if node.func.id in SERIES_FUNCTIONS or (node.func.id in ('shift', 'pct_change') and not windows):
+            windows = [1]  # Compares with the previous session
+        return inner + sum(windows)
+
+    return sessions(tree)
+
+
+def evaluate(tree, matrices):
+    """Evaluate a parsed filter over {field: (symbols x dates) array}"""
+
+    def visit(node):
+        if isinstance(node, ast.Expression):
+            return visit(node.body)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            if node.id not in matrices:
+                raise ScreenError(f"'{node.id}' is a function; call it with arguments")
+            return matrices[node.id]
+        if isinstance(node, ast.Call):
+            args = [visit(arg) for arg in node.args]
+            if node.func.id == 'avg_volume':
+                return sma(matrices['volume'], *args)
+            try:
+                return FUNCTIONS[node.func.id](*args)
+            except TypeError as e:
+                raise ScreenError(f"{node.func.id}(): {e}") from None
+        if isinstance(node, ast.BinOp):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return BIN_OPS[type(node.op)](visit(node.left), visit(node.right))
+        if isinstance(node, ast.UnaryOp):
+            operand = visit(node.operand)
+            return np.negative(operand) if isinstance(node.op, ast.USub) else np.logical_not(operand)
+        if isinstance(node, ast.BoolOp):
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = visit(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, visit(value))
+            return result
+        if isinstance(node, ast.Compare):
+            left, result = visit(node.left), True
+            for op, comparator in zip(node.ops, node.comparators):
+                right = visit(comparator)
+                with np.errstate(invalid='ignore'):
+                    result = np.logical_and(result, COMPARE_OPS[type(op)](left, right))
+                left = right
+            return result
+        raise ScreenError(f"'{type(node).__name__}' is not allowed in a screen")
+
+    return visit(tree)
+
+
+def calendar(symbol):
+    """
+    Exchange a symbol trades on, from its Yahoo suffix ('NS', 'BO', ...; 'US' for none).
+    Symbols on one calendar share a screening date.
+    """
+    symbol = symbol.upper()
+    if symbol.startswith('^'):
+        return INDEX_CALENDARS.get(symbol, 'US')
+    return symbol.rsplit('.', 1)[1] if '.' in symbol else 'US'
+
+
+def stack(frames, sessions, as_of=None):
+    """
+    Right-align each symbol's own last `sessions` bars up to `as_of` (a date, one date
+    per frame, or None for no limit) into (symbols x sessions) float64 arrays, NaN-padded
+    on the left. Windows therefore always count a symbol's own sessions, whatever
+    calendar the other symbols trade on. Returns (last_dates, matrices), where
+    last_dates is each symbol's latest bar used (NaT if it has none).
+    """
+    # One concat and one scatter per field, rather than per-symbol column access
+    bars = pd.concat(frames, ignore_index=True)
+    rows = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+    days = bars['date'].to_numpy(dtype='datetime64[D]')
+    keep = np.ones(len(days), dtype=bool)
+    if as_of is not None:
+        limit = np.broadcast_to(np.asarray(as_of, dtype='datetime64[D]'), len(frames))
+        keep = days <= limit[rows]
+    rows, days = rows[keep], days[keep]
+    values = bars[[field.capitalize() for field in FIELDS]].to_numpy(dtype=float)[keep]
+
+    # Frames are in date order, so a bar's column follows from its place in its frame
+    counts = np.bincount(rows, minlength=len(frames))
+    starts = np.cumsum(counts) - counts
+    columns = sessions - counts[rows] + (np.arange(len(rows)) - starts[rows])
+    used = columns >= 0
+    matrices = {}
+    for i, field in enumerate(FIELDS):
+        matrices[field] = np.full((len(frames), sessions), np.nan)
+        matrices[field][rows[used], columns[used]] = values[used, i]
+
+    last_dates = np.full(len(frames), np.datetime64('NaT'), dtype='datetime64[D]')
+    has_bars = counts > 0
+    last_dates[has_bars] = days[starts[has_bars] + counts[has_bars] - 1]
+    return last_dates, matrices
+
+
+def screen_frames(tree, symbols, frames, as_of=None):
+    """
+    Rows for every symbol passing the filter on its calendar's screening date:
+    `as_of[calendar(symbol)]`, or by default the latest bar among these frames on
+    that calendar. A symbol without a bar on that date is stale and never matches.
+    """
+    symbols = [s for s, f in zip(symbols, frames) if not f.empty]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    calendars = [calendar(symbol) for symbol in symbols]
+    if as_of is None:
+        as_of = {}
+        for cal, frame in zip(calendars, frames):
+            as_of[cal] = max(as_of.get(cal, frame['date'].iloc[-1]), frame['date'].iloc[-1])
+    screening_dates = np.array([as_of.get(cal) or 'NaT' for cal in calendars], dtype='datetime64[D]')
+
+    # Enough history for the filter and for the result columns, whatever the filter
+    last_dates, matrices = stack(frames, max(lookback(tree), VOLUME_AVERAGE + 1), screening_dates)
+    passed = np.broadcast_to(evaluate(tree, matrices), matrices['close'].shape)
+    fresh = last_dates == screening_dates
+    hits = np.flatnonzero(np.asarray(passed[:, -1], dtype=bool) & fresh)
+
+    close, volume = matrices['close'][:, -1], matrices['volume'][:, -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = pct_change(matrices['close'])[:, -1]
+        volume_ratio = volume / sma(matrices['volume'], VOLUME_AVERAGE)[:, -1]
+    return pd.DataFrame({
+        'symbol': np.asarray(symbols, dtype=object)[hits],
+        'date': pd.to_datetime(last_dates[hits]),
+        'close': close[hits].round(2),
+        'change_percent': change[hits].round(2),
+        'volume': volume[hits],
+        'volume_ratio': volume_ratio[hits].round(2),
+    }, columns=RESULT_COLUMNS)
+
+
+def screen_chunk(expression, symbols, store_dir, as_of=None):
+    """Worker: load a chunk of symbols from the store and screen it on the `as_of` dates"""
+    store = PriceStore(store_dir)
+    return screen_frames(parse(expression), symbols, [store.bars(symbol) for symbol in symbols], as_of)
+
+
+def run_screen(expression, store_dir, symbols=None, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Screen `symbols` (default: everything in the store) and return the matching rows,
+    biggest movers first. Raises ScreenError for an invalid expression.
+    """
+    parse(expression)  # Fail fast, before any process starts
+    store = PriceStore(store_dir)
+    symbols = list(symbols) if symbols is not None else store.symbols()
+    # One screening date per calendar for every chunk: that exchange's latest bar
+    groups = {}
+    for symbol in symbols:
+        groups.setdefault(calendar(symbol), []).append(symbol)
+    as_of = {cal: store.last_bar_date(group) for cal, group in groups.items()}
+    workers = workers or os.cpu_count() or 1
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    with span('screener.run', symbols=len(symbols), chunks=len(chunks)):
+        if len(chunks) <= 1 or workers == 1:
+            results = [screen_chunk(expression, chunk, store_dir, as_of) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                results = list(pool.map(screen_chunk, [expression] * len(chunks), chunks,
+                                        [store_dir] * len(chunks), [as_of] * len(chunks)))
+    results = [r for r in results if not r.empty]
+    if not results:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return (pd.concat(results, ignore_index=True)
+            .sort_values('change_percent', ascending=False, key=lambda s: s.abs())
+            .reset_index(drop=True))
@@ -0,0 +1,143 @@
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+import pandas as pd
+from screener import PRESETS, RESULT_COLUMNS, VOLUME_AVERAGE, ScreenError
+
+HEADINGS = ('Symbol', 'Date', 'Close', 'Change %', 'Volume', f'Volume / {VOLUME_AVERAGE}d Avg')
+
+
+class ScreenerWindow(tk.Toplevel):
+    """Filter every cached symbol with a screener expression; double-click a row to open it."""
+
+    def __init__(self, parent, stock_data_provider, open_symbol_callback):
+        super().__init__(parent)
+        self.stock_data_provider = stock_data_provider
+        self.open_symbol_callback = open_symbol_callback
+
+        self.title("Stock Screener")
+        self.geometry("820x560")
+
+        self.results = None
+        self.sort_column = 'change_percent'
+        self.sort_descending = True
+        self.running = False
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Setup the preset picker, expression entry and results table."""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.rowconfigure(2, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+
+        controls = ttk.Frame(main_frame)
+        controls.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 5))
+        controls.columnconfigure(3, weight=1)
+
+        ttk.Label(controls, text="Preset:").grid(row=0, column=0, padx=(0, 5))
+        self.preset_var = tk.StringVar()
+        preset_box = ttk.Combobox(controls, textvariable=self.preset_var, values=list(PRESETS),
+                                  state='readonly', width=30)
+        preset_box.grid(row=0, column=1, padx=(0, 10))
+        preset_box.bind('<<ComboboxSelected>>', self.on_preset)
+
+        ttk.Label(controls, text="Filter:").grid(row=0, column=2, padx=(0, 5))
+        self.expression_var = tk.StringVar()
+        expression_entry = ttk.Entry(controls, textvariable=self.expression_var)
+        expression_entry.grid(row=0, column=3, sticky=(tk.W, tk.E), padx=(0, 10))
+        expression_entry.bind('<Return>', lambda e: self.run_screen())
+
+        self.run_button = ttk.Button(controls, text="Run", command=self.run_screen)
+        self.run_button.grid(row=0, column=4)
+
+        ttk.Label(main_frame, foreground='gray', text=(
+            "Fields: open, high, low, close, volume.  Functions: sma, highest, lowest, shift, "
+            "pct_change, crossed_above, crossed_below, avg_volume.")).grid(row=1, column=0, sticky=tk.W, pady=(0, 5))
+
+        # Results table; click a heading to sort by it
+        table_frame = ttk.Frame(main_frame)
+        table_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.tree = ttk.Treeview(table_frame, columns=RESULT_COLUMNS, show='headings')
+        for column, heading in zip(RESULT_COLUMNS, HEADINGS):
+            self.tree.heading(column, text=heading, command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=110, anchor=tk.W if column == 'symbol' else tk.E)
+        scrollbar = ttk.Scrollbar(table_frame, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind('<Double-1>', self.on_double_click)
+
+        self.status_var = tk.StringVar(value="Pick a preset or type a filter, then Run.")
+        ttk.Label(main_frame, textvariable=self.status_var).grid(row=3, column=0, sticky=tk.W, pady=(5, 0))
+
+    def on_preset(self, event=None):
+        self.expression_var.set(PRESETS[self.preset_var.get()])
+        self.run_screen()
+
+    def run_screen(self):
+        """Screen the cached universe on a background thread."""
+        expression = self.expression_var.get().strip()
+        if not expression or self.running:
+            return
+        self.running = True
+        self.run_button.config(state=tk.DISABLED)
+        self.status_var.set(f"Screening: {expression}")
+        threading.Thread(target=self._screen, args=(expression,), daemon=True).start()
+
+    def _screen(self, expression):
+        try:
+            results, error = self.stock_data_provider.screen(expression), None
+        except ScreenError as e:
+            results, error = None, e
+        except Exception as e:
+            print(f"Error running screen '{expression}': {e}")
+            results, error = None, e
+        try:
+            self.after(0, self.show_results, expression, results, error)
+        except (tk.TclError, RuntimeError):
+            pass  # The window was closed while screening
+
+    def show_results(self, expression, results, error):
+        self.running = False
+        self.run_button.config(state=tk.NORMAL)
+        if error is not None:
+            self.status_var.set("Screen failed.")
+            messagebox.showerror("Screener", str(error), parent=self)
+            return
+        self.results = results
+        self.fill_table()
+        # Each exchange is screened on its own latest session
+        dates = results['date'].unique()
+        date = f" on {pd.Timestamp(dates[0]):%Y-%m-%d}" if len(dates) == 1 else ""
+        self.status_var.set(f"{len(results)} symbols matched{date}: {expression}")
+
+    def sort_by(self, column):
+        """Sort on a column; clicking the same heading again reverses the order."""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, column != 'symbol'
+        self.fill_table()
+
+    def fill_table(self):
+        self.tree.delete(*self.tree.get_children())
+        if self.results is None:
+            return
+        rows = self.results.sort_values(self.sort_column, ascending=not self.sort_descending, na_position='last')
+        for row in rows.itertuples(index=False):
+            self.tree.insert('', tk.END, values=(
+                row.symbol,
+                f"{row.date:%Y-%m-%d}",
+                f"{row.close:.2f}",
+                f"{row.change_percent:+.2f}",
+                f"{row.volume:,.0f}",
+                f"{row.volume_ratio:.2f}",
+            ))
+
+    def on_double_click(self, event):
+        """Open the selected symbol in the main view."""
+        item = self.tree.identify_row(event.y)
+        if item:
+            self.open_symbol_callback(self.tree.item(item, 'values')[0])
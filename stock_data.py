@@ -1,25 +1,86 @@
-import yfinance as yf
 import pandas as pd
+import numpy as np
+import threading
 from datetime import datetime
-from gnews import GNews # Import the GNews library
+from data_backends import LiveBackend
+from price_store import PriceStore, OHLCV_COLUMNS
+from price_series import PriceSeries
+from cache import TTLCache, SingleFlight
+from news_archive import NewsArchive
+from news_tagger import HeadlineTagger, SYMBOL_ALIASES, aliases_for
+from tracing import span
+from transport import DataSourceError
+
+# Columns returned by get_batch_quotes
+QUOTE_COLUMNS = ['price', 'change', 'change_percent', 'volume']
+
+# How long each kind of data stays fresh in memory, in seconds
+CACHE_TTLS = {
+    # Shorter than the 30 s auto-refresh so each tick sees fresh data
+    'history': 20,
+    'news': 300,
+}
+
+# Most recent archived headlines handed to the news panel per symbol
+NEWS_PANEL_LIMIT = 50
+
+# General feeds pulled once per market-news refresh, then tagged to symbols locally
+MARKET_NEWS_TOPICS = ('BUSINESS',)
+MARKET_NEWS_QUERIES = ('Sensex Nifty', 'NSE stocks', 'stock market India')
 
 class StockDataProvider:
-    def __init__(self):
-        # Initialize the GNews client once for efficiency.
-        # It will fetch news from India in English.
-        self.google_news = GNews(language='en', country='IN', max_results=10)
-        
+    def __init__(self, store=None, backend=None, cache_size=512, news_archive=None):
+        # Where prices and news come from: live Yahoo/Google News, or a replay backend
+        self.backend = backend or LiveBackend()
+        # Local on-disk OHLCV store, so only new bars are downloaded
+        self.price_store = store or PriceStore()
+        # Shared in-memory cache; concurrent identical requests share one fetch
+        self.cache = TTLCache(maxsize=cache_size, ttls=CACHE_TTLS)
+        self._in_flight = SingleFlight()
+        # SQLite headline archive, opened on first use so price-only callers never touch it
+        self._news_archive = news_archive
+        self._archive_lock = threading.Lock()
+        # Headline tagger, rebuilt only when the set of symbols changes
+        self._tagger = None
+
+    @property
+    def news_archive(self):
+        with self._archive_lock:
+            if self._news_archive is None:
+                self._news_archive = NewsArchive()
+            return self._news_archive
+
+    def _cached(self, kind, key, fetch):
+        """Return a cached value, or fetch it once no matter how many threads ask"""
+        value = self.cache.get(kind, key)
+        if value is not None:
+            return value
+
+        def load():
+            # Another caller may have filled the cache while we waited
+            value = self.cache.get(kind, key)
+            if value is None:
+                value = fetch()
+                self.cache.set(kind, key, value)
+            return value
+
+        return self._in_flight.do((kind, key), load)
+
+    def _get_series(self, symbol, period="1y"):
+        """Full daily history as a shared PriceSeries, via the memory cache and the on-disk store"""
+        return self._cached('history', (symbol.upper(), period),
+                            lambda: PriceSeries.from_frame(symbol.upper(), self.price_store.get(
+                                symbol, period, lambda **kwargs: self._fetch_ohlcv(symbol, **kwargs))))
+
     def get_stock_price(self, symbol):
-        """Get current stock price and basic info using yfinance"""
+        """Get current stock price and basic info, derived from the cached history"""
         try:
-            ticker = yf.Ticker(symbol)
-            # Use history() to get the most recent closing price
-            hist = ticker.history(period="2d")
-            if hist.empty:
+            series = self._get_series(symbol)
+            if len(series) < 2:
                 return None
 
-            latest_price = hist['Close'].iloc[-1]
-            previous_close = hist['Close'].iloc[-2]
+            latest_price = float(series.close[-1])
+            previous_close = float(series.close[-2])
             
             change = latest_price - previous_close
             change_percent = (change / previous_close) * 100
@@ -29,61 +90,238 @@ class StockDataProvider:
                 'price': round(latest_price, 2),
                 'change': round(change, 2),
                 'change_percent': round(change_percent, 2),
-                'volume': hist['Volume'].iloc[-1],
-                'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                'volume': series.volume[-1],
+                'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                # Set when only stored bars were available; the DataSourceError says why
+                'stale': series.stale,
             }
+        except DataSourceError:
+            # Transport failures (rate limits, outages) go to the caller; anything else means no data
+            raise
         except Exception as e:
             print(f"Error fetching stock data for {symbol}: {e}")
             return None
     
+    def get_batch_quotes(self, symbols):
+        """Get quotes for many symbols with one bulk download and one vectorized pass"""
+        symbols = sorted({s.upper() for s in symbols})
+        if not symbols:
+            return pd.DataFrame(columns=QUOTE_COLUMNS)
+        try:
+            # A few days back so every symbol has a previous close, even after holidays
+            with span('quotes.download', symbols=len(symbols)):
+                data = self.backend.download(symbols, period="5d")
+            if data.empty:
+                return pd.DataFrame(columns=QUOTE_COLUMNS)
+            with span('quotes.compute', symbols=len(symbols)):
+                return compute_quotes(data, symbols)
+        except DataSourceError:
+            raise
+        except Exception as e:
+            print(f"Error fetching batch quotes for {len(symbols)} symbols: {e}")
+            return pd.DataFrame(columns=QUOTE_COLUMNS)
+
+    def get_ohlcv(self, symbol, period="1y"):
+        """Get the full daily OHLCV history (date, Open, High, Low, Close, Volume)"""
+        try:
+            return self._get_series(symbol, period).to_frame()
+        except DataSourceError:
+            raise
+        except Exception as e:
+            print(f"Error fetching OHLCV data for {symbol}: {e}")
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
     def get_historical_data(self, symbol, period="1y"):
-        """Get historical stock data for charting"""
+        """Daily history as a PriceSeries; the cached copy is shared, so callers slice rather than modify"""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
-            
+            return self._get_series(symbol, period)
+        except DataSourceError:
+            raise
+        except Exception as e:
+            print(f"Error fetching historical data for {symbol}: {e}")
+            return PriceSeries.from_frame(symbol.upper(), pd.DataFrame())
+    
+    def get_intraday_bars(self, symbol, since=None):
+        """1-minute bars for the current session, or only those from `since` onwards.
+        Returns the yfinance frame (DatetimeIndex, OHLCV columns); not cached."""
+        try:
+            with span('intraday.fetch', symbol=symbol, since=since):
+                if since is None:
+                    return self.backend.history(symbol, period='1d', interval='1m')
+                return self.backend.history(symbol, start=since, interval='1m')
+        except DataSourceError:
+            raise
+        except Exception as e:
+            print(f"Error fetching intraday data for {symbol}: {e}")
+            return pd.DataFrame()
+
+    def _fetch_ohlcv(self, symbol, period=None, start=None):
+        """Download daily OHLCV bars from Yahoo, either a whole period or from a start date"""
+        with span('history.fetch', symbol=symbol, period=period, start=start):
+            data = self.backend.history(symbol, period=period, start=start)
+        if data.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        with span('history.reshape', symbol=symbol, rows=len(data)):
             # Reset index to make 'Date' a column
-            data.reset_index(inplace=True)
-            # Rename columns to match what the chart widget expects
-            data.rename(columns={'Date': 'date', 'Close': 'price'}, inplace=True)
-            
+            data = data.reset_index().rename(columns={'Date': 'date'})
             # Convert timezone-aware datetimes to timezone-naive
             data['date'] = data['date'].dt.tz_localize(None)
+            return data[OHLCV_COLUMNS]
 
-            return data[['date', 'price']]
-        except Exception as e:
-            print(f"Error fetching historical data for {symbol}: {e}")
-            return pd.DataFrame()
-    
     def get_stock_news(self, symbol):
-        """Get news related to a stock using the gnews library."""
-        # Search for the company name (e.g., "Reliance" from "RELIANCE.NS")
-        search_query = symbol.split('.')[0]
-        
+        """Get Google News headlines for a stock, merged into the archive."""
         try:
-            news_list = self.google_news.get_news(f"{search_query} stock")
-            formatted_news = []
-
-            for article in news_list:
-                # The 'published date' from gnews is a string, e.g., "Sat, 27 Sep 2025 00:00:00 GMT"
-                # We need to parse it into a datetime object for our analysis window.
-                try:
-                    # The format code for parsing the gnews date string
-                    publish_time = datetime.strptime(article['published date'], '%a, %d %b %Y %H:%M:%S GMT')
-                except (ValueError, TypeError):
-                    # If parsing fails or the date is missing, skip this article
-                    continue
-
-                # Transform the gnews article into the format our application needs
-                formatted_news.append({
-                    'title': article['title'],
-                    'time': publish_time.strftime("%Y-%m-%d %H:%M"),
-                    'source': article['publisher']['title'],
-                    'link': article['url'],
-                    'publish_timestamp': publish_time  # The crucial datetime object for the analysis chart
-                })
-            
-            return formatted_news
+            return self._cached('news', symbol.upper(), lambda: self._fetch_news(symbol))
+        except DataSourceError:
+            raise
         except Exception as e:
-            print(f"Error fetching news from GNews for {symbol}: {e}")
-            return []
\ No newline at end of file
+            print(f"Error fetching news from Google News for {symbol}: {e}")
+            return []
+
+    def _fetch_news(self, symbol):
+        """Query Google News, archive anything new and return the latest archived headlines"""
+        with span('news.fetch', symbol=symbol):
+            news_list = self.backend.news(news_query(symbol))
+        with span('news.parse', symbol=symbol, articles=len(news_list)):
+            # Articles already in the archive are not parsed again
+            known = self.news_archive.known_urls([article.get('url') for article in news_list])
+            fresh = format_articles([article for article in news_list if article.get('url') not in known])
+        self.news_archive.merge(symbol, fresh, known)
+        return self.news_archive.for_symbol(symbol, limit=NEWS_PANEL_LIMIT)
+
+    def ingest_market_news(self, symbols=()):
+        """
+        Pull the general market feeds once and archive each headline under every symbol
+        it names. Returns {symbol: headlines tagged}, or None if every feed failed.
+        """
+        feeds = [(self.backend.topic_news, topic) for topic in MARKET_NEWS_TOPICS]
+        feeds += [(self.backend.news, query) for query in MARKET_NEWS_QUERIES]
+        articles, failures = {}, 0
+        for fetch, name in feeds:
+            try:
+                with span('news.fetch', feed=name):
+                    batch = fetch(name)
+            except Exception as e:
+                print(f"Error fetching market news feed '{name}': {e}")
+                failures += 1
+                continue
+            for article in batch:
+                if article.get('url'):
+                    articles.setdefault(article['url'], article)
+        if failures == len(feeds):
+            return None
+
+        with span('news.tag', articles=len(articles)):
+            tagger = self._tagger_for(symbols)
+            tagged = {}
+            for url, article in articles.items():
+                for symbol in tagger.tag(article.get('title') or ''):
+                    tagged.setdefault(symbol, []).append(url)
+
+        with span('news.parse', articles=len(articles)):
+            urls = {url for symbol_urls in tagged.values() for url in symbol_urls}
+            known = self.news_archive.known_urls(list(urls))
+            parsed = {item['link']: item for item in format_articles([articles[url] for url in urls - known])}
+
+        for symbol, symbol_urls in tagged.items():
+            self.news_archive.merge(symbol, [parsed[url] for url in symbol_urls if url in parsed],
+                                    [url for url in symbol_urls if url in known])
+        return {symbol: len(symbol_urls) for symbol, symbol_urls in tagged.items()}
+
+    def _tagger_for(self, symbols):
+        universe = sorted(set(SYMBOL_ALIASES) | {s.upper() for s in symbols})
+        if self._tagger is None or self._tagger.symbols != universe:
+            self._tagger = HeadlineTagger(universe)
+        return self._tagger
+
+    def get_archived_news(self, symbol, start=None, end=None, limit=None):
+        """Archived headlines for a symbol, newest first, without touching the network"""
+        try:
+            return self.news_archive.for_symbol(symbol, start=start, end=end, limit=limit)
+        except Exception as e:
+            print(f"Error reading archived news for {symbol}: {e}")
+            return []
+
+    def search_news(self, text, symbol=None):
+        """Keyword search over archived headlines"""
+        try:
+            return self.news_archive.search(text, symbol=symbol)
+        except Exception as e:
+            print(f"Error searching archived news for '{text}': {e}")
+            return []
+
+    def screen(self, expression, symbols=None):
+        """
+        Run a screener filter over stored histories (default: every cached symbol).
+        Raises screener.ScreenError for an invalid expression.
+        """
+        from screener import run_screen
+        return run_screen(expression, self.price_store.store_dir, symbols)
+
+
+def format_articles(news_list):
+    """Convert gnews articles into the app's news format"""
+    formatted_news = []
+
+    for article in news_list:
+        # The 'published date' from gnews is a string, e.g., "Sat, 27 Sep 2025 00:00:00 GMT"
+        # We need to parse it into a datetime object for our analysis window.
+        try:
+            # The format code for parsing the gnews date string
+            publish_time = datetime.strptime(article['published date'], '%a, %d %b %Y %H:%M:%S GMT')
+        except (ValueError, TypeError):
+            # If parsing fails or the date is missing, skip this article
+            continue
+
+        # Transform the gnews article into the format our application needs
+        formatted_news.append({
+            'title': article['title'],
+            'time': publish_time.strftime("%Y-%m-%d %H:%M"),
+            'source': article['publisher']['title'],
+            'link': article['url'],
+            'publish_timestamp': publish_time  # The crucial datetime object for the analysis chart
+        })
+
+    return formatted_news
+
+
+def news_query(symbol):
+    """Google News search used for a symbol"""
+    # Search for the company name (e.g., "HDFC Bank" for "HDFCBANK.NS"), or the bare ticker
+    search_query = aliases_for(symbol)[0]
+    return f"{search_query} stock"
+
+
+def compute_quotes(data, symbols):
+    """Latest price, change and volume for every symbol of a (dates x symbols) download"""
+    if isinstance(data.columns, pd.MultiIndex):
+        close = data['Close'].reindex(columns=symbols)
+        volume = data['Volume'].reindex(columns=symbols)
+    else:
+        # yfinance returns flat columns when only one symbol was requested
+        close = data[['Close']].set_axis(symbols, axis=1)
+        volume = data[['Volume']].set_axis(symbols, axis=1)
+
+    prices = close.to_numpy(dtype=float)
+    volumes = volume.to_numpy(dtype=float)
+    valid = ~np.isnan(prices)
+
+    # Number each symbol's valid bars from the end: 1 = latest, 2 = previous close
+    rank = valid[::-1].cumsum(axis=0)[::-1] * valid
+    latest = np.where(rank == 1, prices, 0.0).sum(axis=0)
+    previous = np.where(rank == 2, prices, 0.0).sum(axis=0)
+    latest_volume = np.where(rank == 1, np.nan_to_num(volumes), 0.0).sum(axis=0)
+
+    change = latest - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_percent = change / previous * 100
+
+    quotes = pd.DataFrame({
+        'price': latest.round(2),
+        'change': change.round(2),
+        'change_percent': change_percent.round(2),
+        'volume': latest_volume,
+    }, index=pd.Index(symbols, name='symbol'))
+    # Symbols without two bars (bad tickers, fresh listings) have no quote
+    return quotes[valid.sum(axis=0) >= 2]
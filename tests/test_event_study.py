@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from event_study import run_event_study
+
+
+def test_incomplete_windows_are_nan_not_zero():
+    dates = pd.bdate_range('2024-01-01', periods=200)
+    prices = 100 * np.exp(np.cumsum(np.full(200, 0.01)))
+    # One event with a full window, one whose post window runs past the last bar
+    events, curve = run_event_study(dates, prices, [dates[150], dates[196]], before=5, after=10)
+
+    first, recent = events.iloc[0], events.iloc[1]
+    assert np.isclose(first['post_return'], np.expm1(0.11) * 100)
+    assert np.isclose(first['post_car'], 0.0)
+    assert not np.isnan(recent['pre_return'])
+    assert np.isnan(recent['post_return']) and np.isnan(recent['post_car'])
+
+    # Offsets 0..3 have both events; later offsets only the complete one
+    counts = dict(zip(curve['offset'], curve['events']))
+    assert counts[-5] == 2 and counts[3] == 2 and counts[4] == 1 and counts[10] == 1
+    assert np.allclose(curve['mean_car'], 0.0)
+
+
+def test_event_without_history_is_all_nan():
+    dates = pd.bdate_range('2024-01-01', periods=30)
+    events, curve = run_event_study(dates, np.linspace(100, 130, 30), [dates[2]], before=5, after=3)
+    assert events[['pre_return', 'pre_car', 'post_car']].isna().all(axis=None)
+    assert (curve['events'] == 0).all() and curve['mean_car'].isna().all()
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from price_series import PriceSeries
+from price_store import PriceStore, period_start
+from transport import DataSourceError
+
+
+def bars(start, end):
+    dates = pd.bdate_range(start, end)
+    return pd.DataFrame({'date': dates, 'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 100.0})
+
+
+def offline(**kwargs):
+    raise DataSourceError('query1.finance.yahoo.com', 'rate_limited', 'HTTP 429', 429)
+
+
+def test_failed_top_up_serves_stored_bars_as_stale(tmp_path):
+    store = PriceStore(str(tmp_path))
+    full = bars(period_start('1y'), pd.Timestamp.now().normalize() - pd.Timedelta(days=3))
+    first = store.get('ABC', '1y', lambda **kwargs: full)
+    assert 'stale' not in first.attrs
+
+    served = store.get('ABC', '1y', offline)
+    assert len(served) == len(first)
+    assert served.attrs['stale'].kind == 'rate_limited'
+    assert PriceSeries.from_frame('ABC', served)[-5:].stale is served.attrs['stale']
+
+
+def test_failed_download_without_coverage_raises(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.get('ABC', '1mo', lambda **kwargs: bars(period_start('1mo'), pd.Timestamp.now()))
+    # The stored month does not cover a year, so there is nothing to fall back on
+    with pytest.raises(DataSourceError):
+        store.get('ABC', '1y', offline)
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+from price_store import PriceStore
+from screener import (ScreenError, parse, lookback, evaluate, stack, screen_frames,
+                      run_screen, calendar, sma, shift, pct_change, crossed_above)
+
+
+def bars(dates, closes, volume=1000.0):
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({'date': pd.to_datetime(dates), 'Open': closes, 'High': closes + 1,
+                         'Low': closes - 1, 'Close': closes, 'Volume': volume})
+
+
+def matrices(close, volume=None):
+    close = np.asarray(close, dtype=float)
+    return {'open': close, 'high': close, 'low': close, 'close': close,
+            'volume': np.ones_like(close) if volume is None else np.asarray(volume, dtype=float)}
+
+
+@pytest.mark.parametrize('expression', [
+    "__import__('os')", "close.real", "close[0]", "foo > 1", "'a'", "lambda: 1",
+    "sma(close, n=5)", "sma(close, 10 * 5)", "close >",
+])
+def test_parse_rejects(expression):
+    with pytest.raises(ScreenError):
+        parse(expression)
+
+
+def test_lookback_sums_nested_windows():
+    assert lookback(parse("close > 5")) == 1
+    assert lookback(parse("sma(close, 50) > 0")) == 51
+    assert lookback(parse("sma(close, 50.0) > 0")) == 51
+    assert lookback(parse("pct_change(sma(close, 50), 10) > 1")) == 61
+    assert lookback(parse("crossed_above(close, sma(close, 50))")) == 52
+    assert lookback(parse("volume > 2 * avg_volume(20)")) == 21
+
+
+def test_window_functions():
+    x = np.array([[1.0, 2.0, 3.0, 4.0]])
+    np.testing.assert_allclose(sma(x, 2), [[np.nan, 1.5, 2.5, 3.5]])
+    np.testing.assert_allclose(shift(x, 1), [[np.nan, 1.0, 2.0, 3.0]])
+    np.testing.assert_allclose(pct_change(x), [[np.nan, 100.0, 50.0, 100 / 3]])
+    assert crossed_above(np.array([[1.0, 3.0]]), np.array([[2.0, 2.0]])).tolist() == [[False, True]]
+
+
+def test_evaluate_combines_rows_per_symbol():
+    data = matrices([[10, 10, 12],    # up 20%, above its 2-day average
+                     [10, 10, 9],     # down 10%
+                     [10, 10, 10.2]])
+    passed = evaluate(parse("pct_change(close) > 5 and close > sma(close, 2)"), data)
+    assert passed[:, -1].tolist() == [True, False, False]
+    assert evaluate(parse("pct_change(close) < -5 or close == 10.2"), data)[:, -1].tolist() == [False, True, True]
+    with pytest.raises(ScreenError):
+        evaluate(parse("sma > 1"), data)
+
+
+def test_stack_right_aligns_each_symbols_own_bars():
+    frames = [bars(['2024-01-01', '2024-01-02', '2024-01-03'], [1, 2, 3]),
+              bars(['2024-01-01', '2024-01-03', '2024-01-04'], [10, 30, 40])]
+    last_dates, data = stack(frames, 3, as_of='2024-01-03')
+    assert [str(d) for d in last_dates] == ['2024-01-03', '2024-01-03']
+    np.testing.assert_allclose(data['close'], [[1, 2, 3], [np.nan, 10, 30]])
+
+    # Per-frame limits; a frame with no bars by its limit is all NaN
+    last_dates, data = stack(frames, 2, as_of=['2024-01-04', '2023-12-31'])
+    assert str(last_dates[0]) == '2024-01-03' and np.isnat(last_dates[1])
+    np.testing.assert_allclose(data['close'], [[2, 3], [np.nan, np.nan]])
+
+
+def test_mixed_calendars_keep_full_windows():
+    india = pd.bdate_range('2024-01-01', periods=30)
+    # A US symbol trading on days India does not, and missing some India trades on
+    us = india[::2].append(pd.DatetimeIndex(['2024-02-10', '2024-02-11']))
+    frames = [bars(india, np.r_[np.full(29, 100.0), 110.0]),
+              bars(india, np.r_[np.full(29, 100.0), 90.0]),
+              bars(us, np.r_[np.full(len(us) - 1, 50.0), 60.0])]
+    symbols = ['AAA.NS', 'BBB.NS', '^GSPC']
+    result = screen_frames(parse("close > sma(close, 5) * 1.05"), symbols, frames)
+    assert sorted(result['symbol']) == ['AAA.NS', '^GSPC']
+    assert dict(zip(result['symbol'], result['date'])) == {'AAA.NS': india[-1], '^GSPC': us[-1]}
+
+    # Chunking does not change the answer
+    chunked = [screen_frames(parse("close > sma(close, 5) * 1.05"), [symbol], [frame])
+               for symbol, frame in zip(symbols, frames)]
+    assert sorted(pd.concat(chunked)['symbol']) == ['AAA.NS', '^GSPC']
+
+
+def test_screen_frames_volume_ratio_uses_twenty_sessions():
+    dates = pd.bdate_range('2024-01-01', periods=30)
+    volume = np.r_[np.full(29, 100.0), 300.0]
+    result = screen_frames(parse("pct_change(close) < -5"), ['AAA.NS'],
+                           [bars(dates, np.r_[np.full(29, 100.0), 90.0], volume)])
+    assert result['symbol'].tolist() == ['AAA.NS']
+    assert result['change_percent'].iloc[0] == -10.0
+    assert result['volume_ratio'].iloc[0] == round(300 / (19 * 100 + 300) * 20, 2)
+
+
+def test_run_screen_uses_one_date_for_every_chunk(tmp_path):
+    store = PriceStore(str(tmp_path))
+    dates = pd.bdate_range('2024-01-01', periods=25)
+    # The stale symbol moved on its own last bar, a day before everyone else's
+    store.save('STALE.NS', bars(dates[:-1], np.r_[np.full(23, 100.0), 120.0]), {})
+    store.save('FRESH.NS', bars(dates, np.r_[np.full(24, 100.0), 120.0]), {})
+    result = run_screen("pct_change(close) > 5", str(tmp_path), chunk_size=1, workers=1)
+    assert result['symbol'].tolist() == ['FRESH.NS']
+    assert result['date'].tolist() == [dates[-1]]
+
+
+def test_run_screen_dates_each_calendar_separately(tmp_path):
+    store = PriceStore(str(tmp_path))
+    india = pd.bdate_range('2024-01-01', periods=25)
+    # Both moved on their exchange's last session; the US one closed a day earlier
+    store.save('AAA.NS', bars(india, np.r_[np.full(24, 100.0), 120.0]), {})
+    store.save('AAPL', bars(india[:-1], np.r_[np.full(23, 100.0), 120.0]), {})
+    result = run_screen("pct_change(close) > 5", str(tmp_path), chunk_size=1, workers=1)
+    assert sorted(result['symbol']) == ['AAA.NS', 'AAPL']
+
+
+def test_calendar():
+    assert [calendar(s) for s in ('RELIANCE.NS', 'SBIN.BO', 'AAPL', '^NSEI', '^GSPC')] == \
+        ['NS', 'BO', 'US', 'NS', 'US']
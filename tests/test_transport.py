@@ -0,0 +1,104 @@
+import time
+import pickle
+import threading
+import pytest
+import transport
+from transport import DataSourceError, HostLimits, RateLimitedSession, TokenBucket
+from benchmarks.bench_transport import StubServer
+
+
+def test_data_source_error_pickles():
+    error = DataSourceError('query1.finance.yahoo.com', 'rate_limited', "HTTP 429 after retries", 429)
+    restored = pickle.loads(pickle.dumps(error))
+    assert (restored.host, restored.kind, restored.message, restored.status) == \
+        ('query1.finance.yahoo.com', 'rate_limited', "HTTP 429 after retries", 429)
+    assert str(restored) == "query1.finance.yahoo.com: HTTP 429 after retries"
+    assert restored.user_message == error.user_message
+
+
+def test_data_source_error_status_is_optional():
+    restored = pickle.loads(pickle.dumps(DataSourceError('news.google.com', 'network', "timed out")))
+    assert restored.status is None
+    assert str(restored) == "news.google.com: timed out"
+
+
+@pytest.fixture
+def stub():
+    """Start benchmarks/bench_transport.py's throttling stub server; yields a factory returning (server, url)"""
+    servers = []
+
+    def start(rate=1000.0, burst=1000, error_rate=0.0):
+        server = StubServer(rate, burst, error_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, f"http://127.0.0.1:{server.server_address[1]}/v8/finance/chart"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def unthrottled():
+    return RateLimitedSession(rates={'127.0.0.1': (1000.0, 1000)})
+
+
+def test_5xx_is_retried_then_raised_as_http(stub, monkeypatch):
+    monkeypatch.setattr(transport, 'BACKOFF', 0.01)
+    server, url = stub(error_rate=1.0)
+    with pytest.raises(DataSourceError) as error:
+        unthrottled().get(url, timeout=5)
+    assert (error.value.kind, error.value.status) == ('http', 503)
+    assert server.statuses == {503: transport.MAX_RETRIES + 1}
+    # Every retry reused the pooled keep-alive connection
+    assert server.connections == 1
+
+
+def test_exhausted_429s_raise_rate_limited(stub, monkeypatch):
+    # Cap the server's Retry-After: 1 so the retries run quickly
+    monkeypatch.setattr(transport, 'MAX_BACKOFF', 0.01)
+    server, url = stub(rate=0.001, burst=0)
+    session = unthrottled()
+    with pytest.raises(DataSourceError) as error:
+        session.get(url, timeout=5)
+    assert (error.value.kind, error.value.status) == ('rate_limited', 429)
+    assert server.statuses == {429: transport.MAX_RETRIES + 1}
+    assert session.failure_since(0) is error.value
+
+
+def test_retry_after_is_honoured(stub):
+    # One request per second: the second is refused with Retry-After: 1, then admitted
+    server, url = stub(rate=1.0, burst=1)
+    session = unthrottled()
+    assert session.get(url, timeout=5).status_code == 200
+    started = time.monotonic()
+    assert session.get(url, timeout=5).status_code == 200
+    assert time.monotonic() - started >= 0.9
+    assert server.statuses == {200: 2, 429: 1}
+
+
+def test_session_paces_requests_to_the_host_rate(stub):
+    server, url = stub(rate=10.0, burst=1)
+    session = RateLimitedSession(rates={'127.0.0.1': (8.0, 1)})
+    started = time.monotonic()
+    for _ in range(5):
+        assert session.get(url, timeout=5).status_code == 200
+    assert time.monotonic() - started >= 4 / 8.0 - 0.05
+    assert 429 not in server.statuses
+
+
+def test_token_bucket_allows_burst_then_rate():
+    bucket = TokenBucket(rate=50.0, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started < 0.05
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - started >= 5 / 50.0 - 0.01
+
+
+def test_host_limits_share_a_budget_across_subdomains():
+    limits = HostLimits({'yahoo.com': (1.0, 1)})
+    assert limits.key('query1.finance.yahoo.com') == limits.key('query2.finance.yahoo.com') == 'yahoo.com'
+    assert limits.key('notyahoo.com') == 'notyahoo.com'
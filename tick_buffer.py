@@ -0,0 +1,103 @@
+import threading
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# One NSE session is 375 one-minute bars; keep a little more than that
+DEFAULT_CAPACITY = 512
+
+
+class BarRingBuffer:
+    """
+    Fixed-capacity ring of OHLCV bars in preallocated NumPy arrays.
+    Every bar is written twice, at slot i and i + capacity, so the newest `capacity`
+    bars are always one contiguous slice and `view()` never copies. Memory is fixed
+    at creation, however long the app runs.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)   # wall-clock epoch seconds
+        self._bars = np.zeros((len(OHLCV_FIELDS), 2 * capacity), dtype=np.float64)
+        self.start = 0
+        self.count = 0
+        # The poller writes while the Tk thread reads
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.start = self.count = 0
+
+    @property
+    def last_timestamp(self):
+        return int(self._timestamps[self.start + self.count - 1]) if self.count else None
+
+    @property
+    def last_time(self):
+        """The newest bar's time as a naive Timestamp, or None while empty"""
+        return pd.Timestamp(self.last_timestamp, unit='s') if self.count else None
+
+    def _write(self, slot, timestamp, values):
+        slot %= self.capacity
+        for index in (slot, slot + self.capacity):
+            self._timestamps[index] = timestamp
+            self._bars[:, index] = values
+
+    def append(self, timestamp, values):
+        """
+        Add one bar. A bar with the same timestamp as the last one replaces it (the
+        minute is still forming); older bars are ignored. Returns True if a bar was added.
+        """
+        last = self.last_timestamp
+        if last is not None and timestamp <= last:
+            if timestamp == last:
+                self._write(self.start + self.count - 1, timestamp, values)
+            return False
+        if self.count < self.capacity:
+            self._write(self.start + self.count, timestamp, values)
+            self.count += 1
+        else:
+            # Full: the new bar takes the oldest bar's slot and the window moves on by one
+            self._write(self.start, timestamp, values)
+            self.start = (self.start + 1) % self.capacity
+        return True
+
+    def extend(self, frame):
+        """Merge a yfinance-style frame (DatetimeIndex, OHLCV columns); returns bars added"""
+        if frame.empty:
+            return 0
+        index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+        timestamps = index.values.astype('datetime64[s]').astype(np.int64)
+        values = frame[list(OHLCV_FIELDS)].to_numpy(dtype=np.float64)
+        # Only bars from the last stored minute onwards need any work
+        first = 0 if self.count == 0 else int(np.searchsorted(timestamps, self.last_timestamp))
+        with self.lock:
+            return sum(self.append(timestamps[i], values[i]) for i in range(first, len(timestamps)))
+
+    def view(self):
+        """Read-only (timestamps, bars) views of the buffered window; bars is fields x time"""
+        window = slice(self.start, self.start + self.count)
+        timestamps, bars = self._timestamps[window], self._bars[:, window]
+        timestamps.flags.writeable = False
+        bars.flags.writeable = False
+        return timestamps, bars
+
+    def field(self, name):
+        return self.view()[1][OHLCV_FIELDS.index(name)]
+
+    def bar(self, i):
+        """One bar as a dict, in the shape the indicator engine reads"""
+        timestamps, bars = self.view()
+        bar = dict(zip(OHLCV_FIELDS, bars[:, i].tolist()))
+        bar['date'] = pd.Timestamp(int(timestamps[i]), unit='s')
+        return bar
+
+    def to_frame(self):
+        """Copy of the window as a DataFrame with a 'date' column"""
+        timestamps, bars = self.view()
+        frame = pd.DataFrame(bars.T.copy(), columns=list(OHLCV_FIELDS))
+        frame.insert(0, 'date', pd.to_datetime(timestamps, unit='s'))
+        return frame
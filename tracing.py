@@ -0,0 +1,103 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+
+
+class _NoopSpan:
+    """Returned while tracing is off, so a disabled span costs one attribute check."""
+    duration = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ('tracer', 'name', 'args', 'start', 'duration', 'thread')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = None
+        self.duration = None
+        self.thread = None
+
+    def __enter__(self):
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        self.tracer.spans.append(self)
+        return False
+
+
+class Tracer:
+    """Lightweight timing spans kept in a fixed-size ring buffer."""
+
+    def __init__(self, capacity=5000, enabled=False):
+        # deque.append is atomic, so worker threads can record without a lock
+        self.spans = deque(maxlen=capacity)
+        self.enabled = enabled
+        self._origin = time.perf_counter()
+
+    def span(self, name, **args):
+        """Time a block: `with tracer.span('history.fetch', symbol=s): ...`"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, args)
+
+    def recent(self, count=None):
+        """The most recent finished spans, oldest first"""
+        spans = list(self.spans)
+        return spans if count is None else spans[-count:]
+
+    def clear(self):
+        self.spans.clear()
+
+    def to_dicts(self):
+        return [{
+            'name': s.name,
+            'start_ms': round((s.start - self._origin) * 1000, 3),
+            'duration_ms': round(s.duration * 1000, 3),
+            'thread': s.thread,
+            'args': {k: str(v) for k, v in s.args.items()},
+        } for s in self.recent()]
+
+    def export_json(self, path):
+        """Write the buffered spans as a plain JSON list"""
+        with open(path, "w") as f:
+            json.dump(self.to_dicts(), f, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Write the buffered spans in Chrome trace format (open in chrome://tracing or Perfetto)"""
+        events = [{
+            'name': s['name'],
+            'ph': 'X',
+            'ts': s['start_ms'] * 1000,
+            'dur': s['duration_ms'] * 1000,
+            'pid': os.getpid(),
+            'tid': s['thread'],
+            'args': s['args'],
+        } for s in self.to_dicts()]
+        with open(path, "w") as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+# Shared tracer for the whole app; set STOCKSIGHT_TRACE=1 to record from startup
+tracer = Tracer(enabled=os.environ.get("STOCKSIGHT_TRACE") == "1")
+
+
+def span(name, **args):
+    return tracer.span(name, **args)
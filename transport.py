@@ -0,0 +1,179 @@
+"""
+One HTTP layer for every data source: pooled keep-alive connections, a token bucket
+per host, and bounded retries with backoff. Anything that still fails is raised as
+a DataSourceError, so callers can tell "rate limited" from "no such symbol".
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import requests
+from requests.adapters import HTTPAdapter
+
+# Requests per second and burst size per host, matched on the host's domain suffix,
+# so every Yahoo subdomain shares one budget. Quotes cost one Yahoo request per
+# symbol, so its budget lets a 200-symbol watchlist refresh in about 20 seconds;
+# going over it is answered with 429s, which the session backs off from.
+HOST_RATES = {
+    'yahoo.com': (10.0, 20),
+    'news.google.com': (1.0, 3),
+}
+DEFAULT_RATE = (5.0, 10)
+
+# Responses worth another attempt; everything else is returned as is
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF = 0.5       # seconds before the first retry, doubled after each one
+MAX_BACKOFF = 30.0
+
+# Keep-alive connections kept open per host
+POOL_SIZE = 16
+
+
+class DataSourceError(Exception):
+    """
+    A data source failed even after retries. `kind` is 'rate_limited', 'http' or
+    'network'; `status` is the last HTTP status, if there was one.
+    """
+
+    def __init__(self, host, kind, message, status=None):
+        # Keep every argument in args, so the error pickles across process pools
+        super().__init__(host, kind, message, status)
+        self.host = host
+        self.kind = kind
+        self.message = message
+        self.status = status
+
+    def __str__(self):
+        return f"{self.host}: {self.message}"
+
+    @property
+    def user_message(self):
+        if self.kind == 'rate_limited':
+            return f"{self.host} is rate limiting requests; try again in a minute."
+        if self.kind == 'network':
+            return f"Could not reach {self.host}. Check your connection."
+        if self.status is None:
+            return f"{self.host} returned a response that could not be read."
+        return f"{self.host} returned an error ({self.status})."
+
+
+class TokenBucket:
+    """Token bucket: at most `rate` acquisitions per second, with bursts up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = (1 - self.tokens) / self.rate
+            time.sleep(wait_for)
+
+
+class HostLimits:
+    """One TokenBucket per rate-limited domain, created on first use"""
+
+    def __init__(self, rates=None, default=DEFAULT_RATE):
+        self.rates = HOST_RATES if rates is None else rates
+        self.default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def key(self, host):
+        host = (host or '').lower()
+        matches = [domain for domain in self.rates if host == domain or host.endswith('.' + domain)]
+        return max(matches, key=len) if matches else host
+
+    def acquire(self, host):
+        key = self.key(host)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(*self.rates.get(key, self.default))
+        bucket.acquire()
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Seconds to wait before retry `attempt` (0-based): the server's Retry-After, else jittered exponential"""
+    if retry_after:
+        try:
+            return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                moment = parsedate_to_datetime(retry_after)
+                return min(MAX_BACKOFF, max(0.0, (moment - datetime.now(timezone.utc)).total_seconds()))
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF * 2 ** attempt))
+
+
+def _status_error(host, response):
+    kind = 'rate_limited' if response.status_code == 429 else 'http'
+    return DataSourceError(host, kind, f"HTTP {response.status_code} after retries", response.status_code)
+
+
+class RateLimitedSession(requests.Session):
+    """
+    requests.Session that waits for its host's token bucket before every request and
+    retries connection errors, 429s and 5xx responses with backoff. Libraries that
+    swallow exceptions (yfinance does) can still report them: the session remembers
+    the last failure on each thread for `failure_since`.
+    """
+
+    def __init__(self, rates=None, retries=MAX_RETRIES, pool_size=POOL_SIZE):
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self.limits = HostLimits(rates)
+        self.retries = retries
+        # Per thread, so concurrent fetches never see each other's failures
+        self._failures = threading.local()
+
+    def request(self, method, url, *args, **kwargs):
+        host = requests.utils.urlparse(url).hostname
+        for attempt in range(self.retries + 1):
+            self.limits.acquire(host)
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    raise self._failed(DataSourceError(host, 'network', str(e))) from e
+                time.sleep(backoff_delay(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.retries:
+                raise self._failed(_status_error(host, response))
+            retry_after = response.headers.get('Retry-After')
+            response.close()
+            time.sleep(backoff_delay(attempt, retry_after))
+
+    def _failed(self, error):
+        self._failures.last = (time.monotonic(), error)
+        return error
+
+    def failure_since(self, started):
+        """
+        The last DataSourceError raised on this thread, if it was raised after `started`
+        (a time.monotonic() value)
+        """
+        failure = getattr(self._failures, 'last', None)
+        if failure and failure[0] >= started:
+            return failure[1]
+        return None
+
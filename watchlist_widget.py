@@ -0,0 +1,163 @@
+import os
+import json
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+from transport import DataSourceError
+
+DEFAULT_WATCHLIST = ['RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS', 'ICICIBANK.NS']
+WATCHLIST_FILE = os.path.join(os.path.expanduser("~"), ".stocksight", "watchlist.json")
+
+class WatchlistWidget:
+    def __init__(self, parent, stock_data_provider, open_symbol_callback, executor):
+        self.parent = parent
+        self.frame = ttk.Frame(parent)
+        self.stock_data_provider = stock_data_provider
+        self.open_symbol_callback = open_symbol_callback
+        self.executor = executor
+        self.symbols = self.load_symbols()
+        # Held for the whole of a refresh, manual or scheduled, so only one runs at a time
+        self.refreshing = threading.Lock()
+
+        self.setup_watchlist_display()
+
+    def setup_watchlist_display(self):
+        """Setup the add/remove bar and the quotes table"""
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill=tk.X, pady=(0, 5))
+
+        self.symbol_var = tk.StringVar()
+        entry = ttk.Entry(controls, textvariable=self.symbol_var, width=15)
+        entry.pack(side=tk.LEFT, padx=(0, 5))
+        entry.bind('<Return>', self.add_symbols)
+
+        ttk.Button(controls, text="Add", command=self.add_symbols).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Remove", command=self.remove_selected).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Refresh", command=self.refresh).pack(side=tk.LEFT, padx=2)
+
+        table_frame = ttk.Frame(self.frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ('price', 'change', 'change_percent', 'volume')
+        self.tree = ttk.Treeview(table_frame, columns=columns, selectmode='extended')
+        self.tree.heading('#0', text='Symbol')
+        self.tree.column('#0', width=110)
+        for column, heading in zip(columns, ('Price', 'Change', 'Change %', 'Volume')):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=80, anchor=tk.E)
+        self.tree.tag_configure('up', foreground='green')
+        self.tree.tag_configure('down', foreground='red')
+
+        scrollbar = ttk.Scrollbar(table_frame, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Double-click opens the symbol in the main view
+        self.tree.bind('<Double-1>', self.on_double_click)
+
+        # Why the last refresh failed, if it did
+        self.status_var = tk.StringVar()
+        ttk.Label(self.frame, textvariable=self.status_var, foreground='red',
+                  wraplength=350).pack(fill=tk.X, pady=(5, 0))
+
+        for symbol in self.symbols:
+            self.tree.insert('', tk.END, iid=symbol, text=symbol, values=('--', '--', '--', '--'))
+
+    def load_symbols(self):
+        """Load the saved watchlist, or the default one"""
+        try:
+            with open(WATCHLIST_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return list(DEFAULT_WATCHLIST)
+
+    def save_symbols(self):
+        """Persist the watchlist between runs"""
+        try:
+            os.makedirs(os.path.dirname(WATCHLIST_FILE), exist_ok=True)
+            with open(WATCHLIST_FILE, "w") as f:
+                json.dump(self.symbols, f)
+        except OSError as e:
+            print(f"Error saving watchlist: {e}")
+
+    def add_symbols(self, event=None):
+        """Add one or more comma/space separated symbols"""
+        entered = self.symbol_var.get().replace(',', ' ').upper().split()
+        new_symbols = [s for s in dict.fromkeys(entered) if s not in self.symbols]
+        if not new_symbols:
+            return
+        for symbol in new_symbols:
+            self.symbols.append(symbol)
+            self.tree.insert('', tk.END, iid=symbol, text=symbol, values=('--', '--', '--', '--'))
+        self.symbol_var.set("")
+        self.save_symbols()
+        self.refresh()
+
+    def remove_selected(self):
+        """Remove the selected rows from the watchlist"""
+        selected = self.tree.selection()
+        if not selected:
+            messagebox.showinfo("Info", "Select one or more symbols to remove.")
+            return
+        for symbol in selected:
+            self.symbols.remove(symbol)
+            self.tree.delete(symbol)
+        self.save_symbols()
+
+    def refresh(self):
+        """Fetch quotes for the whole watchlist in the background"""
+        if not self.symbols or self.stock_data_provider is None:
+            return
+        if self.refreshing.acquire(blocking=False):
+            self.executor.submit(self.fetch_quotes)
+
+    def refresh_now(self):
+        """Scheduler job, on a worker thread: refresh unless a refresh is already running.
+        Returns False if no quotes came back."""
+        if not self.symbols or self.stock_data_provider is None:
+            return True
+        if not self.refreshing.acquire(blocking=False):
+            return True  # The refresh in flight covers this tick
+        return self.fetch_quotes()
+
+    def fetch_quotes(self):
+        """
+        Runs on a worker thread with `refreshing` held: one batched download for every symbol.
+        A DataSourceError is shown under the table rather than raised, since nothing waits
+        on a manual refresh's future.
+        """
+        symbols = list(self.symbols)
+        try:
+            quotes = self.stock_data_provider.get_batch_quotes(symbols)
+        except DataSourceError as e:
+            print(f"Error refreshing watchlist: {e}")
+            self.frame.after(0, self.status_var.set, f"Quotes not updated: {e.user_message}")
+            return False
+        finally:
+            self.refreshing.release()
+        self.frame.after(0, self.update_quotes, quotes)
+        return not quotes.empty
+
+    def update_quotes(self, quotes):
+        """Update the table rows in place"""
+        self.status_var.set("")
+        for symbol, row in quotes.iterrows():
+            if not self.tree.exists(symbol):
+                continue
+            self.tree.item(symbol, values=(
+                f"₹{row['price']:,.2f}",
+                f"{row['change']:+.2f}",
+                f"{row['change_percent']:+.2f}%",
+                f"{int(row['volume']):,}",
+            ), tags=('up' if row['change'] >= 0 else 'down',))
+
+    def on_double_click(self, event):
+        """Open the double-clicked symbol"""
+        symbol = self.tree.identify_row(event.y)
+        if symbol and self.open_symbol_callback:
+            self.open_symbol_callback(symbol)
+
+    def get_frame(self):
+        """Return the frame widget"""
+        return self.frame